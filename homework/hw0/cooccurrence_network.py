@@ -0,0 +1,174 @@
+import numpy as np
+
+# Maximum number of pair counters for counting pairs with np.bincount (else pairs are sorted).
+MAX_BINCOUNT_SIZE = 2**22
+
+
+def read_chunks(path, chunk_size=2**22, encoding='utf-8'):
+    """
+    Read text file in chunks of specified number of characters.
+
+    Args:
+        path (str): Path to the text file.
+        chunk_size (int): Number of characters in each chunk.
+        encoding (str): Encoding of the text file.
+
+    Returns:
+        (generator): Generator of chunks of text.
+    """
+    with open(path, 'r', encoding=encoding) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _map_symbols(symbols, symbol_to_id):
+    """
+    Map symbols to IDs. Symbols not seen before are assigned the next free IDs.
+
+    Args:
+        symbols (numpy.ndarray): Array of symbols.
+        symbol_to_id (dict): Dictionary mapping symbols to IDs (updated in place).
+
+    Returns:
+        (numpy.ndarray): Array of IDs of symbols.
+    """
+    unique, inverse = np.unique(symbols, return_inverse=True)
+    ids = np.fromiter((symbol_to_id.setdefault(symbol, len(symbol_to_id)) for symbol in unique.tolist()), dtype=np.int64, count=len(unique))
+    return ids[inverse.ravel()]
+
+
+def _count_pairs(ids, num_symbols):
+    """
+    Count pairs of adjacent IDs. If the number of possible pairs is small, the pairs are
+    counted with np.bincount on the combined pair index, else by sorting the pair keys.
+
+    Args:
+        ids (numpy.ndarray): Array of IDs.
+        num_symbols (int): Number of distinct IDs.
+
+    Returns:
+        (tuple): Array of sorted keys of pairs (first ID in upper 32 bits) and array of their counts.
+    """
+    first, second = ids[:-1], ids[1:]
+    if num_symbols*num_symbols <= MAX_BINCOUNT_SIZE:
+        counts = np.bincount(first*num_symbols + second, minlength=num_symbols*num_symbols)
+        idxs = np.flatnonzero(counts)
+        return (idxs//num_symbols << 32) | (idxs % num_symbols), counts[idxs]
+    return np.unique((first << 32) | second, return_counts=True)
+
+
+def _merge_counts(keys, counts, keys_new, counts_new):
+    """
+    Merge counts of pairs.
+
+    Args:
+        keys (numpy.ndarray): Sorted array of keys of pairs.
+        counts (numpy.ndarray): Array of counts of pairs.
+        keys_new (numpy.ndarray): Array of keys of pairs to add.
+        counts_new (numpy.ndarray): Array of counts of pairs to add.
+
+    Returns:
+        (tuple): Sorted array of keys of pairs and array of their counts.
+    """
+    keys_all, inverse = np.unique(np.concatenate((keys, keys_new)), return_inverse=True)
+    return keys_all, np.bincount(inverse.ravel(), weights=np.concatenate((counts, counts_new)), minlength=len(keys_all)).astype(np.int64)
+
+
+def cooccurrence_network(chunks, tokens=False, lower=True):
+    """
+    Construct weighted directed co-occurrence network of characters or tokens from a stream of
+    text chunks. The weight of link (u, v) is the number of times symbol v directly follows symbol u.
+    Only the counts of distinct pairs are kept in memory.
+
+    Args:
+        chunks (iterable): Iterable of chunks of text.
+        tokens (bool): If True, the symbols are whitespace-separated tokens, else characters.
+        lower (bool): If True, convert text to lowercase.
+
+    Returns:
+        (tuple): List of symbols where symbol at position i has ID i (sorted), arrays of
+        source IDs, target IDs and weights of links (sorted by source and target).
+    """
+
+    # Initialize mapping of symbols to IDs and counts of pairs.
+    symbol_to_id = dict()
+    keys, counts = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    last_id = np.zeros(0, dtype=np.int64)
+    partial = ''
+
+    # Go over chunks.
+    for chunk in chunks:
+        chunk = chunk.lower() if lower else chunk
+
+        # Get symbols in chunk. Keep partial last token for next chunk.
+        if tokens:
+            chunk = partial + chunk
+            split = chunk.split()
+            partial = split.pop() if split and not chunk[-1].isspace() else ''
+            symbols = np.array(split)
+        else:
+            symbols = np.frombuffer(chunk.encode('utf-32-le'), dtype=np.uint32)
+        if len(symbols) == 0:
+            continue
+
+        # Map symbols to IDs and count pairs (including pair spanning previous chunk).
+        ids = np.concatenate((last_id, _map_symbols(symbols, symbol_to_id)))
+        keys, counts = _merge_counts(keys, counts, *_count_pairs(ids, len(symbol_to_id)))
+        last_id = ids[-1:]
+
+    # Add last partial token.
+    if partial:
+        ids = np.concatenate((last_id, _map_symbols(np.array([partial]), symbol_to_id)))
+        keys, counts = _merge_counts(keys, counts, *_count_pairs(ids, len(symbol_to_id)))
+
+    # Relabel symbols so that IDs follow the sorted order of symbols.
+    symbols = sorted(symbol_to_id.keys())
+    new_id = np.empty(len(symbols), dtype=np.int64)
+    new_id[[symbol_to_id[symbol] for symbol in symbols]] = np.arange(len(symbols))
+    src, dst = new_id[keys >> 32], new_id[keys & 0xFFFFFFFF]
+    order = np.argsort(src*len(symbols) + dst)
+    symbols = [chr(symbol) for symbol in symbols] if not tokens else symbols
+    return symbols, src[order], dst[order], counts[order]
+
+
+def to_csr(num_symbols, src, dst, weights):
+    """
+    Construct CSR arrays of weighted network from links sorted by source and target.
+
+    Args:
+        num_symbols (int): Number of nodes.
+        src (numpy.ndarray): Array of source IDs.
+        dst (numpy.ndarray): Array of target IDs.
+        weights (numpy.ndarray): Array of weights of links.
+
+    Returns:
+        (tuple): Array of row pointers, array of neighbor IDs and array of weights.
+    """
+    indptr = np.zeros(num_symbols+1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=num_symbols), out=indptr[1:])
+    return indptr, dst, weights
+
+
+def write_edge_list(path, src, dst, weights=None):
+    """
+    Write links to edge list file (one link per line, with weights as third column if specified).
+
+    Args:
+        path (str): Path to the output file.
+        src (numpy.ndarray): Array of source IDs.
+        dst (numpy.ndarray): Array of target IDs.
+        weights (numpy.ndarray): Array of weights of links. If None, weights are not written.
+    """
+    columns = (src, dst) if weights is None else (src, dst, weights)
+    np.savetxt(path, np.column_stack(columns), fmt='%d')
+
+
+### TEST ###
+if __name__ == '__main__':
+    import sys
+    symbols, src, dst, weights = cooccurrence_network(read_chunks(sys.argv[1]), tokens='--tokens' in sys.argv)
+    write_edge_list(sys.argv[2], src, dst, weights)
+    print("Constructed network with {0} nodes and {1} links".format(len(symbols), len(src)))
@@ -0,0 +1,187 @@
+import numpy as np
+
+
+def _resolve_chains(parent, values, idxs):
+    """
+    Resolve values of specified edges that copy the value of their parent edge. Edges with
+    parent -1 and edges not in idxs must already have their final values.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        parent (numpy.ndarray): Index of the edge whose value each edge copies (-1 if none).
+        values (numpy.ndarray): Array of values of edges (updated in place).
+        idxs (numpy.ndarray): Array of indices of edges to resolve.
+    """
+
+    # Get parents of edges being resolved as positions in idxs (-1 if parent value is final).
+    ptr = parent[idxs]
+    pos = np.full(len(parent)+1, -1, dtype=np.int64)
+    pos[idxs] = np.arange(len(idxs))
+    ptr_local = pos[ptr]
+    internal = ptr_local >= 0
+
+    # Copy final values of parents not being resolved.
+    vals = values[idxs]
+    external = ~internal & (ptr >= 0)
+    vals[external] = values[ptr[external]]
+
+    # Perform pointer jumping until all values are resolved.
+    active = np.flatnonzero(ptr_local >= 0)
+    while len(active) > 0:
+        par = ptr_local[active]
+        ptr_nxt = ptr_local[par]
+        par_resolved = ptr_nxt < 0
+        vals[active[par_resolved]] = vals[par[par_resolved]]
+        ptr_local[active] = np.where(par_resolved, -1, ptr_nxt)
+        active = active[~par_resolved]
+
+    values[idxs] = vals
+
+
+def _descendants(children_ptr, children, start):
+    """
+    Get edges whose chain of copied values passes through one of the start edges.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        children_ptr (numpy.ndarray): Array of row pointers into array of children.
+        children (numpy.ndarray): Indices of edges copying the value of each edge (grouped by edge).
+        start (numpy.ndarray): Indices of start edges.
+
+    Returns:
+        (numpy.ndarray): Sorted array of start edges and their descendants.
+    """
+
+    res = [start]
+    frontier = start
+    while len(frontier) > 0:
+        starts = children_ptr[frontier]
+        counts = children_ptr[frontier+1] - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        frontier = children[np.repeat(starts, counts) + offsets]
+        res.append(frontier)
+    return np.unique(np.concatenate(res))
+
+
+def _rows_with_repeats(targets, rows, m):
+    """
+    Find new nodes linked to the same node more than once.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        targets (numpy.ndarray): Second endpoints of edges of new nodes.
+        rows (numpy.ndarray): Indices of new nodes to check.
+        m (int): Number of edges added with each new node.
+
+    Returns:
+        (numpy.ndarray): Indices of new nodes with repeated targets.
+    """
+    targets_sorted = np.sort(targets.reshape(-1, m)[rows], axis=1)
+    return rows[np.any(targets_sorted[:, 1:] == targets_sorted[:, :-1], axis=1)]
+
+
+def _draw(rng, edges, limits, src, parent, values):
+    """
+    Draw uniformly selected entries of the array of endpoints for specified edges. An entry
+    is either the first endpoint of an edge (known) or the second endpoint of an edge (copied).
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        rng (numpy.random.Generator): Random number generator to use.
+        edges (numpy.ndarray): Indices of edges for which to draw the second endpoint.
+        limits (numpy.ndarray): Numbers of entries preceding the edges of the new node for each edge.
+        src (numpy.ndarray): First endpoints of edges.
+        parent (numpy.ndarray): Index of the edge whose value each edge copies (-1 if none).
+        values (numpy.ndarray): Second endpoints of edges.
+    """
+    entries = np.floor(rng.random(len(edges))*limits).astype(np.int64)
+    is_first = entries % 2 == 0
+    parent[edges] = np.where(is_first, -1, entries//2)
+    values[edges[is_first]] = src[entries[is_first]//2]
+
+
+def barabasi_albert_edges(num_nodes, m, m0=None, seed=None):
+    """
+    Construct preferential attachment model (Barabási–Albert model). Start with a fully
+    connected graph on m0 nodes and link each new node to m distinct existing nodes selected
+    with probability proportional to their degrees.
+
+    The endpoints of all edges form an array where a node with degree k appears k times.
+    The second endpoint of each new edge copies a uniformly selected entry preceding the edges
+    of the new node. All such references are resolved at once by pointer jumping. Edges repeating
+    a target of the same node are redrawn and only the edges copying from them are resolved again.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        num_nodes (int): Number of nodes in the model.
+        m (int): Number of edges added with each new node.
+        m0 (int): Number of nodes in the initial fully connected graph. If None, m + 1 is used.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Array of first endpoints and array of second endpoints of edges.
+    """
+
+    # Check parameters.
+    m0 = m + 1 if m0 is None else m0
+    if m0 < max(m, 2) or num_nodes < m0:
+        raise(ValueError("the parameters must satisfy m <= m0 <= num_nodes and m0 >= 2"))
+    rng = np.random.default_rng(seed)
+
+    # Initialize endpoints with edges of fully connected graph followed by edges of new nodes.
+    src_init, dst_init = np.triu_indices(m0, k=1)
+    num_edges_init = len(src_init)
+    new_nodes = np.repeat(np.arange(m0, num_nodes, dtype=np.int64), m)
+    src = np.concatenate((src_init, new_nodes))
+    values = np.concatenate((dst_init, np.empty(len(new_nodes), dtype=np.int64)))
+    parent = np.full(len(src), -1, dtype=np.int64)
+
+    # Draw second endpoints of new edges and resolve them.
+    new_edges = np.arange(num_edges_init, len(src))
+    limits = 2*(num_edges_init + (new_nodes - m0)*m)
+    _draw(rng, new_edges, limits, src, parent, values)
+    _resolve_chains(parent, values, np.flatnonzero(parent >= 0))
+
+    # Build index of edges copying the value of each edge.
+    copying = np.flatnonzero(parent >= 0)
+    children = copying[np.argsort(parent[copying])]
+    children_ptr = np.zeros(len(src)+1, dtype=np.int64)
+    np.cumsum(np.bincount(parent[parent >= 0], minlength=len(src)), out=children_ptr[1:])
+
+    # Redraw repeated targets until all new nodes have distinct targets.
+    redrawn = np.zeros(0, dtype=np.int64)
+    rows = _rows_with_repeats(values[num_edges_init:], np.arange(num_nodes - m0), m)
+    while len(rows) > 0:
+        to_redraw = []
+        for row in rows:
+            targets = values[num_edges_init + row*m:num_edges_init + (row+1)*m]
+            _, first = np.unique(targets, return_index=True)
+            to_redraw.append(num_edges_init + row*m + np.setdiff1d(np.arange(m), first))
+        to_redraw = np.concatenate(to_redraw)
+        _draw(rng, to_redraw, limits[to_redraw - num_edges_init], src, parent, values)
+
+        # Resolve redrawn edges and edges copying from any edge redrawn so far.
+        redrawn = np.union1d(redrawn, to_redraw)
+        changed = _descendants(children_ptr, children, redrawn)
+        _resolve_chains(parent, values, changed)
+        rows = _rows_with_repeats(values[num_edges_init:], np.unique(changed - num_edges_init)//m, m)
+
+    return src, values
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    start = time.time()
+    src, dst = barabasi_albert_edges(10**6, 5, seed=0)
+    print("Constructed model with {0} edges in {1:.2f}s".format(len(src), time.time() - start))
@@ -0,0 +1,139 @@
+import numpy as np
+
+
+def _edge_keys(src, dst, num_nodes):
+    """
+    Get keys of undirected edges that do not depend on the order of endpoints.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        src (numpy.ndarray): First endpoints of edges.
+        dst (numpy.ndarray): Second endpoints of edges.
+        num_nodes (int): Number of nodes.
+
+    Returns:
+        (numpy.ndarray): Keys of edges.
+    """
+    return np.minimum(src, dst)*num_nodes + np.maximum(src, dst)
+
+
+def configuration_model_edges(degrees, simple=False, seed=None):
+    """
+    Construct configuration model with specified degree sequence. A stub is created for each
+    unit of degree and the shuffled stubs are paired consecutively.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        degrees (numpy.ndarray): Degrees of nodes (must sum to an even number).
+        simple (bool): If True, remove self-loops and repeated edges (erased configuration model).
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Array of first endpoints and array of second endpoints of edges.
+    """
+
+    # Check degree sequence.
+    degrees = np.asarray(degrees, dtype=np.int64)
+    if np.any(degrees < 0) or degrees.sum() % 2 != 0:
+        raise(ValueError("the degrees must be non-negative and sum to an even number"))
+    rng = np.random.default_rng(seed)
+
+    # Shuffle stubs and pair consecutive stubs.
+    stubs = rng.permutation(np.repeat(np.arange(len(degrees)), degrees))
+    src, dst = stubs[0::2], stubs[1::2]
+
+    # If constructing simple graph, remove self-loops and repeated edges.
+    if simple:
+        keys = _edge_keys(src, dst, len(degrees))
+        _, first = np.unique(keys, return_index=True)
+        first = np.sort(first)
+        first = first[src[first] != dst[first]]
+        src, dst = src[first], dst[first]
+
+    return src, dst
+
+
+def rewire_edges(src, dst, num_swaps, num_nodes=None, batch_size=None, seed=None):
+    """
+    Randomize simple undirected graph while preserving node degrees using double edge swaps.
+    Edges (a, b) and (c, d) are replaced by (a, d) and (c, b) unless this creates a self-loop
+    or a repeated edge. Swaps are proposed in batches of disjoint pairs of edges and all
+    accepted swaps in a batch are applied at once.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        src (numpy.ndarray): First endpoints of edges.
+        dst (numpy.ndarray): Second endpoints of edges.
+        num_swaps (int): Number of swaps to propose.
+        num_nodes (int): Number of nodes. If None, the largest endpoint plus one is used.
+        batch_size (int): Number of swaps proposed in each batch. If None, a tenth of the number of edges is used.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Array of first endpoints and array of second endpoints of edges and number of accepted swaps.
+    """
+
+    # Initialize edges and set of edge keys (kept sorted).
+    src, dst = np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64)
+    num_edges = len(src)
+    if num_edges < 2:
+        return src, dst, 0
+    num_nodes = int(max(src.max(), dst.max())) + 1 if num_nodes is None else num_nodes
+    batch_size = max(1, num_edges//10) if batch_size is None else batch_size
+    batch_size = min(batch_size, num_edges//2)
+    keys = np.sort(_edge_keys(src, dst, num_nodes))
+    rng = np.random.default_rng(seed)
+
+    num_accepted = 0
+    for start in range(0, num_swaps, batch_size):
+
+        # Select disjoint pairs of edges. Randomly flip second edges so both ways of swapping are proposed.
+        size = min(batch_size, num_swaps - start)
+        edges = rng.choice(num_edges, size=2*size, replace=False)
+        e1, e2 = edges[:size], edges[size:]
+        a, b = src[e1], dst[e1]
+        flip = rng.random(size) < 0.5
+        c, d = np.where(flip, dst[e2], src[e2]), np.where(flip, src[e2], dst[e2])
+
+        # Reject swaps creating self-loops or edges already in the graph.
+        keys1, keys2 = _edge_keys(a, d, num_nodes), _edge_keys(c, b, num_nodes)
+        valid = (a != d) & (c != b) & (keys1 != keys2)
+        for keys_new in (keys1, keys2):
+            pos = np.minimum(np.searchsorted(keys, keys_new), num_edges-1)
+            valid &= keys[pos] != keys_new
+
+        # Reject swaps creating the same edge as another swap in the batch.
+        keys_new = np.concatenate((keys1[valid], keys2[valid]))
+        _, first, counts = np.unique(keys_new, return_index=True, return_counts=True)
+        repeated = np.ones(len(keys_new), dtype=bool)
+        repeated[first[counts == 1]] = False
+        idxs_valid = np.flatnonzero(valid)
+        valid[idxs_valid[repeated[:len(idxs_valid)] | repeated[len(idxs_valid):]]] = False
+
+        # Apply accepted swaps.
+        dst[e1[valid]] = d[valid]
+        src[e2[valid]], dst[e2[valid]] = c[valid], b[valid]
+        num_accepted += np.count_nonzero(valid)
+        keys = np.sort(_edge_keys(src, dst, num_nodes))
+
+    return src, dst, num_accepted
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    rng = np.random.default_rng(0)
+    degrees = np.floor(2.0*(1.0 - rng.random(10**6))**(-1.0/1.5)).astype(np.int64)
+    degrees[0] += degrees.sum() % 2
+    start = time.time()
+    src, dst = configuration_model_edges(degrees, simple=True, seed=0)
+    print("Constructed configuration model with {0} edges in {1:.2f}s".format(len(src), time.time() - start))
+    start = time.time()
+    src, dst, num_accepted = rewire_edges(src, dst, len(src), num_nodes=len(degrees), seed=0)
+    print("Performed {0} swaps in {1:.2f}s".format(num_accepted, time.time() - start))
@@ -1,19 +1,25 @@
 import math
-import random
+import numpy as np
 import networkx as nx
 from collections import Counter
 import matplotlib.pyplot as plt
 
-from select_preferential import select_preferential
+from barabasi_albert import barabasi_albert_edges
+from configuration_model import configuration_model_edges
+from subgraph_extraction import read_edge_chunks, reservoir_sample_nodes, extract_subgraph
 
-# Parse Facebook Social Network graph from file.
+# Facebook Social Network graph is streamed from file in chunks.
 GRAPH_PATH = '../data/facebook'
-graph_fb_full = nx.read_edgelist(GRAPH_PATH, create_using=nx.Graph)
+edges_fb = lambda: read_edge_chunks(GRAPH_PATH)
 
-# Create a subgraph of the Facebook Social Network graph by randomly sampling nodes.
+# Create a subgraph of the Facebook Social Network graph by randomly sampling nodes
+# (first pass samples nodes, second pass keeps edges between sampled nodes).
 SAMPLE_SIZE_FB = 30000
-sampled_nodes = random.sample(graph_fb_full.nodes, SAMPLE_SIZE_FB)
-graph_fb = graph_fb_full.subgraph(sampled_nodes)
+sampled_nodes = reservoir_sample_nodes(edges_fb, SAMPLE_SIZE_FB)
+src_fb, dst_fb = extract_subgraph(edges_fb, sampled_nodes)
+graph_fb = nx.Graph()
+graph_fb.add_nodes_from(sampled_nodes.tolist())
+graph_fb.add_edges_from(zip(src_fb.tolist(), dst_fb.tolist()))
 
 # Compute histogram of node degrees.
 hist_fb = Counter([degree for n, degree in graph_fb.degree()])
@@ -44,29 +50,31 @@ hist_model_er_theoretical = [(mean_k**k)*math.exp(-mean_k)/math.factorial(k) for
 plt.loglog(degrees_model_er_sorted, hist_model_er_theoretical, '-', label="Erdős–Rényi model theoretical degree distribution")
 
 
-# Construct preferential attachment model (Barabási–Albert model).
+# Construct configuration model with same degree sequence (self-loops and repeated edges removed).
+degrees_fb = np.array([degree for _, degree in graph_fb.degree()])
+src_model_cm, dst_model_cm = configuration_model_edges(degrees_fb, simple=True)
 
-# Start with fully connected graph.
-graph_model_ba = nx.complete_graph(math.ceil(mean_k)+1, create_using=nx.Graph)
-node_nxt = max(list(graph_model_ba.nodes())) + 1
+# Compute histogram of node degrees.
+hist_model_cm = Counter(np.bincount(np.concatenate((src_model_cm, dst_model_cm)), minlength=SAMPLE_SIZE_FB).tolist())
 
-for idx in range(SAMPLE_SIZE_FB - math.ceil(mean_k) - 1):
+# Plot degree distribution for model.
+degrees_model_cm = hist_model_cm.keys()
+plt.loglog(list(degrees_model_cm), [hist_model_cm[degree]/SAMPLE_SIZE_FB for degree in degrees_model_cm], 
+        'mo', label="Configuration model degree distribution")
 
-    graph_model_ba.add_node(node_nxt)
 
-    # Select ceil(mean_k/2) existing nodes with probability proportional to their degrees and link to them.
-    for node in select_preferential(dict(graph_model_ba.degree()), n=math.ceil(mean_k/2)):
-        graph_model_ba.add_edge(node_nxt, node)
-    
-    node_nxt += 1
-    print("done {0}/{1}".format(idx, SAMPLE_SIZE_FB-math.ceil(mean_k)-2))
+# Construct preferential attachment model (Barabási–Albert model).
+
+# Start with fully connected graph and link each new node to ceil(mean_k/2) existing nodes
+# selected with probability proportional to their degrees.
+src_model_ba, dst_model_ba = barabasi_albert_edges(SAMPLE_SIZE_FB, m=math.ceil(mean_k/2), m0=math.ceil(mean_k)+1)
 
 # Compute histogram of node degrees.
-hist_model_ba = Counter([degree for n, degree in graph_model_ba.degree()])
+hist_model_ba = Counter(np.bincount(np.concatenate((src_model_ba, dst_model_ba)), minlength=SAMPLE_SIZE_FB).tolist())
 
 # Plot degree distribution for model.
 degrees_model_ba = hist_model_ba.keys()
-plt.loglog(list(degrees_model_ba), [hist_model_ba[degree]/graph_model_ba.number_of_nodes() for degree in degrees_model_ba], 
+plt.loglog(list(degrees_model_ba), [hist_model_ba[degree]/SAMPLE_SIZE_FB for degree in degrees_model_ba], 
         'go', label="Barabási–Albert model degree distribution")
 
 
@@ -0,0 +1,159 @@
+import numpy as np
+
+
+def read_edge_chunks(path, chunk_size=2**24):
+    """
+    Read edge list file in chunks. Lines starting with '#' are skipped and only the first
+    two columns (integer node IDs) of other lines are used.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        path (str): Path to the edge list file.
+        chunk_size (int): Approximate number of bytes read in each chunk.
+
+    Returns:
+        (generator): Generator of tuples of arrays of first and second endpoints of edges.
+    """
+    with open(path, 'r') as f:
+        while True:
+            lines = f.readlines(chunk_size)
+            if not lines:
+                break
+            pairs = [line.split()[:2] for line in lines if line.strip() and not line.startswith('#')]
+            edges = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+            yield edges[:, 0], edges[:, 1]
+
+
+def _mix(x):
+    """
+    Mix bits of 64-bit unsigned integers using the splitmix64 finalizer.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        x (numpy.ndarray): Array of 64-bit unsigned integers.
+
+    Returns:
+        (numpy.ndarray): Array of mixed integers.
+    """
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _node_hash(nodes, seed):
+    """
+    Map node IDs to pseudorandom numbers in interval [0, 1) using the splitmix64 hash function.
+    The same node is always mapped to the same number for the same seed.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        nodes (numpy.ndarray): Array of node IDs.
+        seed (int): Seed of the hash function.
+
+    Returns:
+        (numpy.ndarray): Array of pseudorandom numbers.
+    """
+    with np.errstate(over='ignore'):
+        x = _mix(nodes.astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15))
+    return (x >> np.uint64(11)).astype(np.float64) / float(2**53)
+
+
+def reservoir_sample_nodes(edges, k, seed=None):
+    """
+    Sample k distinct nodes uniformly at random in a pass over the edge stream. Each node is
+    assigned a pseudorandom number computed from its ID and the reservoir keeps the k nodes
+    with the lowest numbers, so nodes appearing in many edges are not favored.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges (e.g. read_edge_chunks).
+        k (int): Number of nodes to sample.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (numpy.ndarray): Sorted array of sampled node IDs.
+    """
+    hash_seed = int(np.random.default_rng(seed).integers(2**63))
+    reservoir = np.zeros(0, dtype=np.int64)
+    for src, dst in edges():
+
+        # Merge nodes in chunk with reservoir and keep nodes with lowest hashes.
+        candidates = np.union1d(reservoir, np.concatenate((src, dst)))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(_node_hash(candidates, hash_seed), k-1)[:k]] if k > 0 else candidates[:0]
+        reservoir = candidates
+
+    return np.sort(reservoir)
+
+
+def sample_node_range(low, high, k, seed=None):
+    """
+    Sample k distinct node IDs uniformly at random from a known range of IDs.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        low (int): Lowest node ID.
+        high (int): Highest node ID plus one.
+        k (int): Number of nodes to sample.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (numpy.ndarray): Sorted array of sampled node IDs.
+    """
+    rng = np.random.default_rng(seed)
+    return np.sort(low + rng.choice(high - low, size=k, replace=False))
+
+
+def extract_subgraph(edges, nodes):
+    """
+    Get edges of subgraph induced by specified nodes in a pass over the edge stream. Membership
+    of endpoints is tested using a bitmap with one bit for each ID up to the largest sampled ID.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges (e.g. read_edge_chunks).
+        nodes (numpy.ndarray): Array of node IDs (non-negative).
+
+    Returns:
+        (tuple): Arrays of first and second endpoints of edges of the subgraph.
+    """
+
+    # Construct membership bitmap.
+    nodes = np.asarray(nodes, dtype=np.int64)
+    max_id = int(nodes.max()) if len(nodes) > 0 else -1
+    bitmap = np.zeros(max_id//8 + 1, dtype=np.uint8)
+    np.bitwise_or.at(bitmap, nodes >> 3, (1 << (nodes & 7)).astype(np.uint8))
+
+    def is_member(ids):
+        in_range = (ids >= 0) & (ids <= max_id)
+        ids = np.where(in_range, ids, 0)
+        return in_range & ((bitmap[ids >> 3] >> (ids & 7)) & 1).astype(bool)
+
+    # Keep edges with both endpoints in the bitmap.
+    res_src, res_dst = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for src, dst in edges():
+        keep = is_member(src) & is_member(dst)
+        res_src.append(src[keep])
+        res_dst.append(dst[keep])
+    return np.concatenate(res_src), np.concatenate(res_dst)
+
+
+### TEST ###
+if __name__ == '__main__':
+    edges = lambda: read_edge_chunks('../data/karate.txt')
+    nodes = reservoir_sample_nodes(edges, 10, seed=0)
+    src, dst = extract_subgraph(edges, nodes)
+    print("Sampled nodes {0} with {1} edges between them".format(nodes.tolist(), len(src)))
@@ -0,0 +1,174 @@
+import numpy as np
+
+
+class WeightedSampler:
+    """
+    Sampler of indices with probability proportional to their weights. The weights are
+    kept in a Fenwick tree (binary indexed tree) so that both drawing an index and
+    changing a weight take O(log n) time.
+
+    Author:
+        Jernej Vivod (vivod.jernej@gmail.com)
+
+    Args:
+        weights (numpy.ndarray): Non-negative weights of indices.
+        seed (int): Seed for the random number generator.
+    """
+
+    def __init__(self, weights, seed=None):
+
+        # Initialize weights and random number generator.
+        self.weights = np.array(weights, dtype=float)
+        self.size = len(self.weights)
+        self.rng = np.random.default_rng(seed)
+
+        # Build Fenwick tree in linear time. Element i of the tree (1-based) holds
+        # the sum of the weights at positions i - lowbit(i) + 1, ..., i.
+        cumsum = np.concatenate(([0.0], np.cumsum(self.weights)))
+        idxs = np.arange(1, self.size+1)
+        self.tree = np.zeros(self.size+1, dtype=float)
+        self.tree[1:] = cumsum[idxs] - cumsum[idxs - (idxs & -idxs)]
+
+        # Get largest power of two not exceeding the number of indices (for descending the tree).
+        self.top_step = 1 << (self.size.bit_length() - 1) if self.size > 0 else 0
+
+
+    def total(self):
+        """
+        Get sum of all weights.
+
+        Author:
+            Jernej Vivod (vivod.jernej@gmail.com)
+
+        Returns:
+            (float): Sum of all weights.
+        """
+        res = 0.0
+        idx = self.size
+        while idx > 0:
+            res += self.tree[idx]
+            idx -= idx & -idx
+        return res
+
+
+    def update(self, idx, weight):
+        """
+        Set weight of index.
+
+        Author:
+            Jernej Vivod (vivod.jernej@gmail.com)
+
+        Args:
+            idx (int): Index for which to set the weight.
+            weight (float): New weight.
+        """
+        delta = weight - self.weights[idx]
+        self.weights[idx] = weight
+        pos = idx + 1
+        while pos <= self.size:
+            self.tree[pos] += delta
+            pos += pos & -pos
+
+
+    def _find(self, rem):
+        """
+        Find index at which the cumulative sum of weights first exceeds specified value.
+
+        Author:
+            Jernej Vivod (vivod.jernej@gmail.com)
+
+        Args:
+            rem (float): Value in interval [0, total weight).
+
+        Returns:
+            (int): The index.
+        """
+        pos = 0
+        step = self.top_step
+        while step > 0:
+            if pos + step <= self.size and self.tree[pos + step] <= rem:
+                pos += step
+                rem -= self.tree[pos]
+            step >>= 1
+        return min(pos, self.size-1)
+
+
+    def draw(self):
+        """
+        Draw index with probability proportional to its weight.
+
+        Author:
+            Jernej Vivod (vivod.jernej@gmail.com)
+
+        Returns:
+            (int): The drawn index.
+        """
+        return self._find(self.rng.random()*self.total())
+
+
+    def draw_without_replacement(self, n):
+        """
+        Draw n distinct indices where each next index is drawn with probability
+        proportional to its weight among the indices not yet drawn.
+
+        Author:
+            Jernej Vivod (vivod.jernej@gmail.com)
+
+        Args:
+            n (int): Number of indices to draw.
+
+        Returns:
+            (list): List of drawn indices.
+        """
+
+        # Check if enough indices with positive weight.
+        if n > np.count_nonzero(self.weights > 0):
+            raise(ValueError("number of indices to draw exceeds number of indices with positive weight"))
+
+        # Draw indices and temporarily set their weights to zero.
+        res = []
+        removed_weights = []
+        for _ in range(n):
+            idx = self.draw()
+            res.append(idx)
+            removed_weights.append(self.weights[idx])
+            self.update(idx, 0.0)
+
+        # Restore weights of drawn indices.
+        for idx, weight in zip(res, removed_weights):
+            self.update(idx, weight)
+        return res
+
+
+    def draw_batch(self, size):
+        """
+        Draw a batch of indices independently (with replacement). The tree is descended
+        for all draws at once.
+
+        Author:
+            Jernej Vivod (vivod.jernej@gmail.com)
+
+        Args:
+            size (int): Number of indices to draw.
+
+        Returns:
+            (numpy.ndarray): Array of drawn indices.
+        """
+        rem = self.rng.random(size)*self.total()
+        pos = np.zeros(size, dtype=np.int64)
+        step = self.top_step
+        while step > 0:
+            nxt = np.minimum(pos + step, self.size)
+            move = (pos + step <= self.size) & (self.tree[nxt] <= rem)
+            rem -= np.where(move, self.tree[nxt], 0.0)
+            pos += np.where(move, step, 0)
+            step >>= 1
+        return np.minimum(pos, self.size-1)
+
+
+### TEST ###
+if __name__ == '__main__':
+    sampler = WeightedSampler([1, 0, 2, 7], seed=0)
+    print(np.bincount(sampler.draw_batch(100000), minlength=4)/100000)
+    sampler.update(3, 0)
+    print(np.bincount(sampler.draw_batch(100000), minlength=4)/100000)
@@ -1,8 +1,12 @@
 import networkx as nx
 import parse_network
+import betweenness
+import ranking
+import pagerank
+import centrality
 
 
-def node_importances(graph, measure):
+def node_importances(graph, measure, **kwargs):
     """
     Compute node importance scores according to specified measure.
     Author: Jernej Vivod
@@ -10,26 +14,30 @@ def node_importances(graph, measure):
     Args:
         graph (obj): Networkx representation of the graph
         measure (str): Argument specifying the node importance measure to use.
+        **kwargs (dict): Keyword arguments for the function computing the PageRank scores
+        or the approximate betweenness.
     Returns:
         (dict): Dictionary mapping node indices to their estimated importances.
     """
     
     # Check if specified measure valid.
-    if measure not in {'degree_centrality', 'PageRank', 'betweenness', 'closeness'}:
-        raise(ValueError("the measure parameter can take the values of 'degree_centrality', 'PageRank', 'betweenness' or 'closeness'"))
+    if measure not in {'degree_centrality', 'PageRank', 'betweenness', 'approximate_betweenness', 'closeness'}:
+        raise(ValueError("the measure parameter can take the values of 'degree_centrality', 'PageRank', 'betweenness', 'approximate_betweenness' or 'closeness'"))
 
     # Compute node importances according to specified measure.
     if measure == 'degree_centrality':
         return nx.degree_centrality(graph)
     elif measure == 'PageRank':
-        return nx.pagerank(graph)
+        return pagerank.pagerank(graph, **kwargs)[0]
     elif measure == 'betweenness':
-        return nx.betweenness_centrality(graph)
+        return betweenness.betweenness_centrality(graph)
+    elif measure == 'approximate_betweenness':
+        return betweenness.approximate_betweenness_centrality(graph, **kwargs)[0]
     elif measure == 'closeness':
         return nx.closeness_centrality(graph)
 
 
-def node_rank(graph, idx_node, measure):
+def node_rank(graph, idx_node, measure, cache=None, **kwargs):
     """
     Compute node importance rank according to specified measure.
     Author: Jernej Vivod
@@ -38,31 +46,25 @@ def node_rank(graph, idx_node, measure):
         graph (obj): Networkx representation of the graph
         idx_node (str): Index of node for which to compute the rank.
         measure (str): Argument specifying the node importance measure to use.
+        cache (obj): RankingCache instance for the graph. If None, the measure is computed from scratch.
+        **kwargs (dict): Keyword arguments for the function computing the PageRank scores
+        or the approximate betweenness.
     
     Returns:
         (int): Ranking of specified node according to specified importance measure.
     """
     
     # Check if specified measure valid.
-    if measure not in {'degree_centrality', 'PageRank', 'betweenness', 'closeness'}:
-        raise(ValueError("the measure parameter can take the values of 'degree_centrality', 'PageRank', 'betweenness' or 'closeness'"))
+    if measure not in {'degree_centrality', 'PageRank', 'betweenness', 'approximate_betweenness', 'closeness'}:
+        raise(ValueError("the measure parameter can take the values of 'degree_centrality', 'PageRank', 'betweenness', 'approximate_betweenness' or 'closeness'"))
     
     # Compute rank of node according to specified measure.
-    if measure == 'degree_centrality':
-        est_imp = nx.degree_centrality(graph)
-        return [key for key, val in sorted(est_imp.items(), key=lambda x: x[1], reverse=True)].index(idx_node)
-    elif measure == 'PageRank':
-        est_imp = nx.pagerank(graph)
-        return [key for key, val in sorted(est_imp.items(), key=lambda x: x[1], reverse=True)].index(idx_node)
-    elif measure == 'betweenness':
-        est_imp = nx.betweenness_centrality(graph)
-        return [key for key, val in sorted(est_imp.items(), key=lambda x: x[1], reverse=True)].index(idx_node)
-    elif measure == 'closeness':
-        est_imp = nx.closeness_centrality(graph)
-        return [key for key, val in sorted(est_imp.items(), key=lambda x: x[1], reverse=True)].index(idx_node)
+    if cache is None:
+        cache = ranking.RankingCache(graph, node_importances)
+    return int(cache.get(measure, **kwargs).rank([idx_node])[0])
 
 
-def data_most_important(importance_dict, n_most_important, include_additional=None):
+def data_most_important(importance_dict, n_most_important, include_additional=None, node_names=None):
     """
     Compute data for making a bar plot of n nodes with highest estimated importance.
     Author: Jernej Vivod
@@ -70,28 +72,36 @@ def data_most_important(importance_dict, n_most_important, include_additional=No
     Args:
         importance_dict (dict): Dictionary mapping node indices to their estimated importances
         n_most_important (int): Number of most imporant nodes to keep
-        include_additional (str): Index of additional node from graph to include in plot data.
-        This node's data is appended to the front of the resulting lists.
+        include_additional (str or list): Index (or list of indices) of additional nodes from graph to
+        include in plot data. The data of these nodes is appended to the front of the resulting lists.
+        node_names (dict): Dictionary mapping node indices to their names. If None, the names are
+        taken from the parsed graph.
     Returns:
         (tuple): tuple of lists of names of n most important nodes and importance scores of these nodes.
     """
 
-    # Sort nodes by their evaluated importance.
-    sorted_nodes = [(k, v) for k, v in sorted(importance_dict.items(), key=lambda el: el[1], reverse=True)]
-    x = [nx.get_node_attributes(graph, 'name')[el[0]] for el in sorted_nodes[:n_most_important]]
-    y = [el[1] for el in sorted_nodes[:n_most_important]]
+    # Get names of nodes.
+    if node_names is None:
+        node_names = nx.get_node_attributes(graph, 'name')
+
+    # Select most important nodes.
+    top_nodes = ranking.top_k_nodes(importance_dict, n_most_important)
+    x = [node_names[node] for node, _ in top_nodes]
+    y = [score for _, score in top_nodes]
     
-    # If including additional specified node, add data for it if not yet present.
-    if include_additional and nx.get_node_attributes(graph, 'name')[include_additional] not in x:
-        x.insert(0, nx.get_node_attributes(graph, 'name')[include_additional])
-        y.insert(0, list(filter(lambda x: x[0] == include_additional, sorted_nodes))[0][1])
+    # If including additional specified nodes, add data for them if not yet present.
+    if include_additional:
+        additional = include_additional if isinstance(include_additional, (list, tuple)) else [include_additional]
+        for node in reversed(additional):
+            if node_names[node] not in x:
+                x.insert(0, node_names[node])
+                y.insert(0, importance_dict[node])
     
     return x, y
 
 
 if __name__ == '__main__':
     import matplotlib.pyplot as plt
-    from scipy import stats
     
     # Set name of dolphin of interest.
     DOLPHIN_NAME = 'SN100'
@@ -100,12 +110,22 @@ if __name__ == '__main__':
     graph = parse_network.parse_network("../data/dolphins", create_using=nx.Graph)
     
     # Get index of node corresponding to the dolphin of interest.
-    idx_dolphin = [el[0] for el in nx.get_node_attributes(graph, 'name').items() if el[1] == 'SN100'][0]
+    node_names = nx.get_node_attributes(graph, 'name')
+    idx_dolphin = [el[0] for el in node_names.items() if el[1] == 'SN100'][0]
+
+    # Initialize cache of rankings so that each measure is computed only once.
+    cache = ranking.RankingCache(graph, node_importances)
+
+    # Compute degree centrality, PageRank, betweenness and closeness together (one BFS sweep) and cache them.
+    measures = {'degree_centrality': 'degree', 'PageRank': 'pagerank', 'betweenness': 'betweenness', 'closeness': 'closeness'}
+    scores, nodes = centrality.centralities(graph, list(measures.values()))
+    for col, measure in enumerate(measures):
+        cache.put(measure, dict(zip(nodes, scores[:, col])))
 
     ### Bar charts of centralities ###
-    importances_degree_centrality = node_importances(graph, 'degree_centrality')
-    rank1 = node_rank(graph, idx_dolphin, 'degree_centrality')
-    x_bar1, y_bar1 = data_most_important(importances_degree_centrality, 10, include_additional=idx_dolphin)
+    importances_degree_centrality = cache.get('degree_centrality').importances
+    rank1 = node_rank(graph, idx_dolphin, 'degree_centrality', cache=cache)
+    x_bar1, y_bar1 = data_most_important(importances_degree_centrality, 10, include_additional=idx_dolphin, node_names=node_names)
     fig1, ax1 = plt.subplots()
     barlist1 = ax1.bar(x_bar1, y_bar1)
     barlist1[0].set_color('r')
@@ -113,11 +133,11 @@ if __name__ == '__main__':
     print("degree centrality for dolphin {0}: {1:.4f}".format(DOLPHIN_NAME, y_bar1[0]))
     print("degree centrality rank for dolphin {0}: {1}".format(DOLPHIN_NAME, rank1+1))
     print("percentile of degree centrality for dolphin {0}: {1:.4f}".format(DOLPHIN_NAME, 
-        stats.percentileofscore(list(importances_degree_centrality.values()), y_bar1[0])))
+        cache.get('degree_centrality').percentile([idx_dolphin])[0]))
     
-    importances_pagerank = node_importances(graph, 'PageRank')
-    rank2 = node_rank(graph, idx_dolphin, 'PageRank')
-    x_bar2, y_bar2 = data_most_important(importances_pagerank, 10, include_additional=idx_dolphin)
+    importances_pagerank = cache.get('PageRank').importances
+    rank2 = node_rank(graph, idx_dolphin, 'PageRank', cache=cache)
+    x_bar2, y_bar2 = data_most_important(importances_pagerank, 10, include_additional=idx_dolphin, node_names=node_names)
     fig2, ax2 = plt.subplots()
     barlist2 = ax2.bar(x_bar2, y_bar2)
     barlist2[0].set_color('r')
@@ -125,11 +145,11 @@ if __name__ == '__main__':
     print("PageRank centrality for dolphin {0}: {1:.4f}".format(DOLPHIN_NAME, y_bar2[0]))
     print("PageRank centrality rank for dolphin {0}: {1}".format(DOLPHIN_NAME, rank2+1))
     print("percentile of PageRank centrality for dolphin {0}: {1:.4f}".format(DOLPHIN_NAME, 
-        stats.percentileofscore(list(importances_pagerank.values()), y_bar2[0])))
+        cache.get('PageRank').percentile([idx_dolphin])[0]))
     
-    importances_betweenness_centrality = node_importances(graph, 'betweenness')
-    rank3 = node_rank(graph, idx_dolphin, 'betweenness')
-    x_bar3, y_bar3 = data_most_important(importances_betweenness_centrality, 10, include_additional=idx_dolphin)
+    importances_betweenness_centrality = cache.get('betweenness').importances
+    rank3 = node_rank(graph, idx_dolphin, 'betweenness', cache=cache)
+    x_bar3, y_bar3 = data_most_important(importances_betweenness_centrality, 10, include_additional=idx_dolphin, node_names=node_names)
     fig3, ax3 = plt.subplots()
     barlist3 = ax3.bar(x_bar3, y_bar3)
     barlist3[0].set_color('r')
@@ -137,11 +157,11 @@ if __name__ == '__main__':
     print("betweenness centrality for dolphin {0}: {1:.4f}".format(DOLPHIN_NAME, y_bar3[0]))
     print("betweenness centrality rank for dolphin {0}: {1}".format(DOLPHIN_NAME, rank3+1))
     print("percentile of betweenness centrality for dolphin {0}: {1:.4f}".format(DOLPHIN_NAME, 
-        stats.percentileofscore(list(importances_betweenness_centrality.values()), y_bar3[0])))
+        cache.get('betweenness').percentile([idx_dolphin])[0]))
     
-    importances_closeness_centrality = node_importances(graph, 'closeness')
-    rank4 = node_rank(graph, idx_dolphin, 'closeness')
-    x_bar4, y_bar4 = data_most_important(importances_closeness_centrality, 10, include_additional=idx_dolphin)
+    importances_closeness_centrality = cache.get('closeness').importances
+    rank4 = node_rank(graph, idx_dolphin, 'closeness', cache=cache)
+    x_bar4, y_bar4 = data_most_important(importances_closeness_centrality, 10, include_additional=idx_dolphin, node_names=node_names)
     fig4, ax4 = plt.subplots()
     barlist4 = ax4.bar(x_bar4, y_bar4)
     barlist4[0].set_color('r')
@@ -149,7 +169,7 @@ if __name__ == '__main__':
     print("closeness centrality for dolphin {0}: {1:.4f}".format(DOLPHIN_NAME, y_bar4[0]))
     print("closeness centrality rank for dolphin {0}: {1}".format(DOLPHIN_NAME, rank4+1))
     print("percentile of closeness centrality for dolphin {0}: {1:.4f}".format(DOLPHIN_NAME, 
-        stats.percentileofscore(list(importances_closeness_centrality.values()), y_bar4[0])))
+        cache.get('closeness').percentile([idx_dolphin])[0]))
    
     plt.show()
     
@@ -1,7 +1,7 @@
 import networkx as nx
-import math
-import collections
 import matplotlib.pyplot as plt
+import degree_distribution
+import power_law
 
 
 def plot_degree_distributions(graph):
@@ -14,51 +14,21 @@ def plot_degree_distributions(graph):
     """
     
     # Compute relative degree, in-degree and out-degree frequencies.
-    degree_count = collections.Counter(dict(graph.degree()).values())
-    sum_deg_count = sum(degree_count.values())
-    degree_dist = {key:degree_count[key]/sum_deg_count for key in degree_count.keys()}
-    assert sum(degree_dist.values()) - 1.0 < 1.0e-4
-
-    in_degree_count = collections.Counter(dict(graph.in_degree()).values())
-    sum_in_deg_count = sum(in_degree_count.values())
-    in_degree_dist = {key:in_degree_count[key]/sum_in_deg_count for key in in_degree_count.keys()}
-    assert sum(in_degree_dist.values()) - 1.0 < 1.0e-4
-
-    out_degree_count = collections.Counter(dict(graph.out_degree()).values())
-    sum_out_deg_count = sum(out_degree_count.values())
-    out_degree_dist = {key:out_degree_count[key]/sum_out_deg_count for key in out_degree_count.keys()}
-    assert sum(out_degree_dist.values()) - 1.0 < 1.0e-4
+    hist, in_hist, out_hist = degree_distribution.graph_degree_histograms(graph)
+    degrees, degree_dist = degree_distribution.pmf(hist)
+    in_degrees, in_degree_dist = degree_distribution.pmf(in_hist)
+    out_degrees, out_degree_dist = degree_distribution.pmf(out_hist)
 
     # Plot relative degree frequencies on doubly-logarithmic plot.
     fig, ax = plt.subplots()
-    ax.loglog(list(degree_dist.keys()), list(degree_dist.values()), 'bo', label="degree relative frequency")
-    ax.loglog(list(in_degree_dist.keys()), list(in_degree_dist.values()), 'ro', label="in-degree relative frequency")
-    ax.loglog(list(out_degree_dist.keys()), list(out_degree_dist.values()), 'go', label="out-degree relative frequency")
+    ax.loglog(degrees, degree_dist, 'bo', label="degree relative frequency")
+    ax.loglog(in_degrees, in_degree_dist, 'ro', label="in-degree relative frequency")
+    ax.loglog(out_degrees, out_degree_dist, 'go', label="out-degree relative frequency")
     ax.legend()
 
     return fig, ax
 
 
-def power_law_exponent(degrees, min_degree):
-    """
-    Evaluate power-law exponent gamma using maximum-likelihood estimate.
-    Author: Jernej Vivod
-
-    Args:
-        degrees (list): List of node degrees
-        min_degree (int): Degree cut-off
-
-    Returns:
-        (float): maximum-likelihood estimate of the power-law exponent.
-    """
-
-    # Count number of nodes falling below the threshold.
-    n = len(list(filter(lambda x: x >= min_degree, degrees)))
-
-    # Compute maximum-likelihood estimate for gamma.
-    return 1 + n*((sum([math.log(degree/(min_degree - 0.5)) for degree in degrees if degree >= min_degree]))**(-1.0))
-
-
 if __name__ == '__main__':
     
     ### Parse graphs ###
@@ -88,9 +58,11 @@ if __name__ == '__main__':
     ax2.set_xlabel(xlabel)
     ax2.set_ylabel(ylabel)
     
-    # Compute power-law exponent using maximum-likelihood estimation.
-    gamma1 = power_law_exponent(dict(graph_java.in_degree()).values(), min_degree=3)
-    gamma2 = power_law_exponent(dict(graph_lucene.in_degree()).values(), min_degree=3)
+    # Fit power law to in-degrees (x_min selected by KS distance, p-value by bootstrap).
+    gamma1, xmin1, ks1, p1 = power_law.power_law_test(list(dict(graph_java.in_degree()).values()), seed=0)
+    gamma2, xmin2, ks2, p2 = power_law.power_law_test(list(dict(graph_lucene.in_degree()).values()), seed=0)
+    print("{0}: gamma={1:.3f}, x_min={2}, KS={3:.4f}, p={4:.3f}".format(title1, gamma1, xmin1, ks1, p1))
+    print("{0}: gamma={1:.3f}, x_min={2}, KS={3:.4f}, p={4:.3f}".format(title2, gamma2, xmin2, ks2, p2))
      
     # If plotting exponent estimate on plot. 
     if PLOT_EXPONENT_ESTIMATE:
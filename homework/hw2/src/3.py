@@ -1,5 +1,6 @@
 import networkx as nx
 import parse_network
+import random_graphs
 import random
 
 def remove_frac_nodes(graph, frac, remove_hubs):
@@ -127,7 +128,7 @@ if __name__ == '__main__':
     graph = parse_network.parse_network(PATH, create_using=nx.Graph)
     
     # Construct Erdos-Renyi model with same number of nodes and edges.
-    graph_er_model = nx.gnm_random_graph(graph.number_of_nodes(), graph.number_of_edges())
+    graph_er_model = random_graphs.csr_to_networkx(*random_graphs.gnm(graph.number_of_nodes(), graph.number_of_edges()))
 
     # Initialize list of fractions of nodes to remove.
     fracs = [0, 0.1, 0.2, 0.3, 0.4, 0.5]
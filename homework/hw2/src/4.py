@@ -1,9 +1,13 @@
 import networkx as nx
+import numpy as np
 import parse_network
-import random
-import collections
+import degree_distribution
+import csr
+import random_walks
+import sampling
+import shortest_paths
 
-def random_walk(graph, frac_sample=0.1):
+def random_walk(graph, frac_sample=0.1, num_walkers=1, seed=None):
     """
     Perform random walk on specified graph until specified fraction
     of nodes have been covered. Return graph induced by such a random
@@ -12,34 +16,27 @@ def random_walk(graph, frac_sample=0.1):
     Args:
         (obj): Networkx graph representation.
         frac_sample: Fraction of nodes in graph to cover.
+        num_walkers (int): Number of walkers moving at once (all start at the same node).
+        seed (int): Seed for the random number generator.
 
     Returns:
         (obj): Networkx graph representation of the graph induced
         by the random walk.
     """
     
-    # Intialize set of visited nodes.
-    visited = set()
-
-    # Initialize set of traversed edges.
-    walk_edges = set()
+    # Get CSR representation of graph.
+    indptr, indices, nodes = csr.graph_to_csr(graph)
 
     # Randomly choose starting node.
-    start_node = random.choice(list(graph.nodes()))
-    node_current = start_node
+    rng = np.random.default_rng(seed)
+    start_node = rng.integers(len(nodes))
     
-    # While specified fraction of network not covered, perform random walk.
-    while len(visited) < frac_sample*graph.number_of_nodes():
-        
-        # Visit randomly chosen neighbor of current node and add to results sets.
-        node_nxt = random.choice(list(graph.neighbors(node_current)))
-        visited.add(node_nxt)
-        walk_edges.add((node_current, node_nxt))
-        node_current = node_nxt
+    # While specified fraction of network not covered, perform random walks.
+    _, src, dst, _ = random_walks.random_walks(indptr, indices, np.full(num_walkers, start_node), frac_cover=frac_sample, seed=rng)
     
     # Construct graph from traversed edges and return it.
     ind_graph = nx.Graph()
-    ind_graph.add_edges_from(walk_edges)
+    ind_graph.add_edges_from((nodes[u], nodes[v]) for u, v in zip(src.tolist(), dst.tolist()))
     return ind_graph
 
 
@@ -53,21 +50,32 @@ if __name__ == '__main__':
     graph = parse_network.parse_network(PATH, create_using=nx.Graph)
     
     # Get graph induced by random walk that covers 10% of the nodes.
-    ind_graph = random_walk(graph, 0.06)
+    ind_graph = random_walk(graph, 0.06, num_walkers=100)
 
     # Print average distance and clustering in original and sampled graph.
-    # print("Average distance - original graph: {0}".format(nx.average_shortest_path_length(graph)))
-    print("Average distance - sampled graph: {0}".format(nx.average_shortest_path_length(ind_graph)))
+    # Average distances are estimated from BFS runs from sampled sources (with 95% confidence intervals).
+    dist_original, ci_original, _ = shortest_paths.graph_average_shortest_path_length(graph, seed=0)
+    print("Average distance - original graph: {0} ({1[0]}, {1[1]})".format(dist_original, ci_original))
+    dist_sampled, ci_sampled, _ = shortest_paths.graph_average_shortest_path_length(ind_graph, seed=0)
+    print("Average distance - sampled graph: {0} ({1[0]}, {1[1]})".format(dist_sampled, ci_sampled))
 
     # print("Average clustering - original graph: {0}".format(nx.average_clustering(graph)))
     print("Average clustering - sampled graph: {0}".format(nx.average_clustering(ind_graph)))
+
+    # Get forest fire sample with same number of nodes directly from the edge list file.
+    _, src_ff, dst_ff = sampling.forest_fire_sample(lambda: sampling.read_edge_chunks(PATH), ind_graph.number_of_nodes())
+    ff_graph = nx.Graph()
+    ff_graph.add_edges_from(zip(src_ff.tolist(), dst_ff.tolist()))
+    print("Average clustering - forest fire sample: {0}".format(nx.average_clustering(ff_graph)))
     
     # Plot degree distributions for original and sampled graphs.
-    degree_freq_original = collections.Counter(dict(graph.degree()).values())
-    x_original, y_original = list(degree_freq_original.keys()), list(degree_freq_original.values())
+    hist_original, _, _ = degree_distribution.graph_degree_histograms(graph)
+    x_original = np.flatnonzero(hist_original)
+    y_original = hist_original[x_original]
 
-    degree_freq_induced = collections.Counter(dict(ind_graph.degree()).values())
-    x_ind, y_ind = list(degree_freq_induced.keys()), list(degree_freq_induced.values())
+    hist_induced, _, _ = degree_distribution.graph_degree_histograms(ind_graph)
+    x_ind = np.flatnonzero(hist_induced)
+    y_ind = hist_induced[x_ind]
     
     fig, ax = plt.subplots() 
     ax.loglog(x_original, y_original, 'bo')
@@ -0,0 +1,523 @@
+import os
+import math
+import multiprocessing
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.csgraph as csgraph
+import csr
+
+
+# Number of sampled paths per task of approximate betweenness computation.
+SAMPLES_PER_TASK = 256
+
+# CSR arrays of the graph being processed and of the graph with reversed edges and work arrays
+# of the bidirectional BFS (set in each worker process).
+_indptr = None
+_indices = None
+_rev_indptr = None
+_rev_indices = None
+_work = None
+
+
+def _init_worker(indptr, indices, rev_indptr=None, rev_indices=None):
+    """
+    Store CSR arrays of the graph in the worker process so that they are
+    not sent along with each task. If the arrays of the graph with reversed
+    edges are given, allocate work arrays for sampling shortest paths.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        rev_indptr (numpy.ndarray): Array of row pointers of the graph with reversed edges.
+        rev_indices (numpy.ndarray): Array of neighbor indices of the graph with reversed edges.
+    """
+
+    global _indptr, _indices, _rev_indptr, _rev_indices, _work
+    _indptr = indptr
+    _indices = indices
+    _rev_indptr = rev_indptr
+    _rev_indices = rev_indices
+    _work = _bfs_work_arrays(len(indptr) - 1) if rev_indptr is not None else None
+
+
+def _expand_frontier(indptr, indices, frontier):
+    """
+    Get all edges leaving the nodes in the frontier.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        frontier (numpy.ndarray): Array of node indices.
+
+    Returns:
+        (tuple): Array of edge sources and array of edge targets.
+    """
+
+    # Get start positions and lengths of neighbor lists.
+    starts = indptr[frontier]
+    degs = indptr[frontier+1] - starts
+
+    # Gather neighbor lists into a single array of targets.
+    offsets = np.arange(degs.sum()) - np.repeat(np.cumsum(degs) - degs, degs)
+    return np.repeat(frontier, degs), indices[np.repeat(starts, degs) + offsets]
+
+
+def _expand_level(indptr, indices, frontier, dist, sigma, depth):
+    """
+    Expand BFS frontier by one level. Set distances and numbers of shortest paths
+    of newly discovered nodes and get shortest-path edges leading to them.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        frontier (numpy.ndarray): Array of indices of nodes at current depth.
+        dist (numpy.ndarray): Array of distances (-1 for undiscovered nodes, updated in place).
+        sigma (numpy.ndarray): Array of numbers of shortest paths (updated in place).
+        depth (int): Current depth.
+
+    Returns:
+        (tuple): Array of edge sources and array of edge targets of shortest-path edges.
+    """
+    parents, children = _expand_frontier(indptr, indices, frontier)
+
+    # Set distances of newly discovered nodes and keep edges leading to next level.
+    dist[children[dist[children] == -1]] = depth + 1
+    on_path = dist[children] == depth + 1
+    parents, children = parents[on_path], children[on_path]
+
+    # Count shortest paths to nodes in next level.
+    np.add.at(sigma, children, sigma[parents])
+    return parents, children
+
+
+def _bfs_levels(indptr, indices, source, target=None):
+    """
+    Perform level-synchronous BFS from source node and keep shortest-path edges
+    between consecutive levels.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        source (int): Index of the source node.
+        target (int): If not None, stop the search once the level containing this node is reached.
+
+    Returns:
+        (tuple): Array of distances (-1 for unreachable nodes), array of numbers of shortest paths
+        and list of tuples of arrays of edge sources and targets for each level.
+    """
+
+    # Initialize distances and numbers of shortest paths.
+    num_nodes = len(indptr) - 1
+    dist = np.full(num_nodes, -1, dtype=np.int64)
+    sigma = np.zeros(num_nodes, dtype=float)
+    dist[source] = 0
+    sigma[source] = 1.0
+
+    # Perform BFS one level at a time.
+    levels = []
+    frontier = np.array([source], dtype=np.int64)
+    while frontier.size > 0 and (target is None or dist[target] == -1):
+        parents, children = _expand_level(indptr, indices, frontier, dist, sigma, len(levels))
+        levels.append((parents, children))
+        frontier = np.unique(children)
+
+    return dist, sigma, levels
+
+
+def single_source_dependencies(indptr, indices, source):
+    """
+    Compute dependencies of source node on all other nodes using a level-synchronous
+    BFS and the dependency accumulation step of Brandes' algorithm.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        source (int): Index of the source node.
+
+    Returns:
+        (numpy.ndarray): Dependencies of the source node on all nodes.
+    """
+
+    # Perform BFS and get shortest-path edges between consecutive levels.
+    _, sigma, levels = _bfs_levels(indptr, indices, source)
+    return accumulate_dependencies(sigma, levels, source)
+
+
+def accumulate_dependencies(sigma, levels, source):
+    """
+    Accumulate dependencies of source node from the deepest BFS level towards the source
+    (dependency accumulation step of Brandes' algorithm).
+    Author: Jernej Vivod
+
+    Args:
+        sigma (numpy.ndarray): Array of numbers of shortest paths from the source.
+        levels (list): List of tuples of arrays of shortest-path edge sources and targets for each level.
+        source (int): Index of the source node.
+
+    Returns:
+        (numpy.ndarray): Dependencies of the source node on all nodes.
+    """
+    delta = np.zeros(len(sigma), dtype=float)
+    for parents, children in reversed(levels):
+        np.add.at(delta, parents, sigma[parents]/sigma[children]*(1.0 + delta[children]))
+    delta[source] = 0.0
+    return delta
+
+
+def _partial_betweenness(sources):
+    """
+    Sum dependencies over a partition of source nodes (executed in worker process).
+    Author: Jernej Vivod
+
+    Args:
+        sources (numpy.ndarray): Indices of source nodes in partition.
+
+    Returns:
+        (numpy.ndarray): Partial (unnormalized) betweenness values of all nodes.
+    """
+
+    partial = np.zeros(len(_indptr) - 1, dtype=float)
+    for source in sources:
+        partial += single_source_dependencies(_indptr, _indices, source)
+    return partial
+
+
+def betweenness_centrality(graph, normalized=True, num_workers=None):
+    """
+    Compute exact betweenness centrality using Brandes' algorithm on CSR arrays.
+    The source nodes are partitioned among worker processes and the partial
+    results are summed.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+        normalized (bool): Normalize values in the same way as networkx's betweenness_centrality.
+        num_workers (int): Number of worker processes to use. If None, use number of CPUs.
+
+    Returns:
+        (dict): Dictionary mapping node indices to their betweenness centralities.
+    """
+
+    # Get CSR representation of graph.
+    indptr, indices, nodes = csr.graph_to_csr(graph)
+    num_nodes = len(nodes)
+    num_workers = os.cpu_count() if num_workers is None else num_workers
+
+    # Partition source nodes (interleaved to balance the work among partitions).
+    num_parts = max(1, min(num_nodes, 4*num_workers))
+    partitions = [np.arange(idx, num_nodes, num_parts) for idx in range(num_parts)]
+
+    # Compute partial results and reduce them.
+    if num_workers == 1:
+        _init_worker(indptr, indices)
+        res = sum(map(_partial_betweenness, partitions), np.zeros(num_nodes))
+    else:
+        with multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(indptr, indices)) as pool:
+            res = sum(pool.imap(_partial_betweenness, partitions), np.zeros(num_nodes))
+
+    # Rescale results.
+    res *= rescale_factor(num_nodes, graph.is_directed(), normalized)
+
+    return dict(zip(nodes, res))
+
+
+def rescale_factor(num_nodes, directed, normalized):
+    """
+    Get factor for rescaling summed dependencies to betweenness centralities.
+    Author: Jernej Vivod
+
+    Args:
+        num_nodes (int): Number of nodes in the graph.
+        directed (bool): Whether the graph is directed.
+        normalized (bool): Normalize by number of pairs of nodes not including the node.
+
+    Returns:
+        (float): The rescaling factor.
+    """
+
+    if normalized:
+        return 1.0/((num_nodes-1)*(num_nodes-2)) if num_nodes > 2 else 1.0
+    else:
+        return 1.0 if directed else 0.5
+
+
+def _vertex_diameter_bound(indptr, indices, directed):
+    """
+    Compute upper bound for the vertex diameter (number of nodes on the longest
+    shortest path) of the graph.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        directed (bool): Whether the graph is directed.
+
+    Returns:
+        (int): Upper bound for the vertex diameter.
+    """
+
+    # For directed graphs, use the trivial bound.
+    num_nodes = len(indptr) - 1
+    if directed:
+        return num_nodes
+
+    # Label connected components and take first node of each as its root.
+    adj = sp.csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(num_nodes, num_nodes))
+    _, labels = csgraph.connected_components(adj, directed=False)
+    _, roots = np.unique(labels, return_index=True)
+
+    # Perform BFS from all roots at once. The distance between any two nodes
+    # in a component is at most twice the eccentricity of its root.
+    dist = np.full(num_nodes, -1, dtype=np.int64)
+    dist[roots] = 0
+    frontier = roots
+    depth = 0
+    while frontier.size > 0:
+        _, children = _expand_frontier(indptr, indices, frontier)
+        frontier = np.unique(children[dist[children] == -1])
+        depth += 1
+        dist[frontier] = depth
+    return 2*int(dist.max()) + 1
+
+
+def _walk_back(levels, sigma, node, depth, rng):
+    """
+    Walk back from node towards the root of the BFS choosing predecessors with probability
+    proportional to their numbers of shortest paths and return the nodes visited before the root.
+    Author: Jernej Vivod
+
+    Args:
+        levels (list): List of tuples of arrays of shortest-path edge sources and targets for each level.
+        sigma (numpy.ndarray): Array of numbers of shortest paths from the root.
+        node (int): Index of the starting node.
+        depth (int): Distance of the starting node from the root.
+        rng (numpy.random.Generator): Random number generator to use.
+
+    Returns:
+        (list): Indices of visited nodes (excluding the starting node and the root).
+    """
+    visited = []
+    for level in range(depth-1, 0, -1):
+        parents, children = levels[level]
+        candidates = parents[children == node]
+        weights = sigma[candidates]
+        node = rng.choice(candidates, p=weights/weights.sum())
+        visited.append(node)
+    return visited
+
+
+def _bfs_work_arrays(num_nodes):
+    """
+    Allocate arrays of distances and numbers of shortest paths for the forward
+    and backward search of the bidirectional BFS.
+    Author: Jernej Vivod
+
+    Args:
+        num_nodes (int): Number of nodes in the graph.
+
+    Returns:
+        (tuple): List of two arrays of distances (filled with -1) and list of two
+        arrays of numbers of shortest paths (filled with 0).
+    """
+    return [np.full(num_nodes, -1, dtype=np.int64) for _ in range(2)], [np.zeros(num_nodes, dtype=float) for _ in range(2)]
+
+
+def _sample_path_internal_nodes(indptr, indices, rev_indptr, rev_indices, source, target, rng, work=None):
+    """
+    Sample shortest path between source and target nodes uniformly at random using balanced
+    bidirectional BFS and return its internal nodes. In each step, the side whose frontier
+    has the smaller total degree is expanded by one level. Once the expanded level contains
+    nodes discovered by the other side, these nodes are exactly the nodes at that distance
+    from the source on shortest paths. One of them is chosen with probability proportional
+    to the number of shortest paths through it and the path is completed by walking back
+    towards both ends. Only the entries of the work arrays of visited nodes are reset at
+    the end, so the cost of a sample does not depend on the number of nodes.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        rev_indptr (numpy.ndarray): Array of row pointers of the graph with reversed edges.
+        rev_indices (numpy.ndarray): Array of neighbor indices of the graph with reversed edges.
+        source (int): Index of the source node.
+        target (int): Index of the target node.
+        rng (numpy.random.Generator): Random number generator to use.
+        work (tuple): Work arrays returned by _bfs_work_arrays (reused between calls). If None, the arrays are allocated.
+
+    Returns:
+        (list): Indices of internal nodes of the sampled path (empty if target not reachable).
+    """
+
+    # Initialize searches from source (forward) and from target (backward).
+    graphs = ((indptr, indices), (rev_indptr, rev_indices))
+    dist, sigma = _bfs_work_arrays(len(indptr) - 1) if work is None else work
+    frontiers = [np.array([source], dtype=np.int64), np.array([target], dtype=np.int64)]
+    levels = [[], []]
+    for side, end in enumerate((source, target)):
+        dist[side][end] = 0
+        sigma[side][end] = 1.0
+
+    # Expand cheaper side until the searches meet (or one of them ends).
+    meeting = np.zeros(0, dtype=np.int64)
+    while meeting.size == 0 and frontiers[0].size > 0 and frontiers[1].size > 0:
+        costs = [np.sum(ptr[frontier+1] - ptr[frontier]) for (ptr, _), frontier in zip(graphs, frontiers)]
+        side = 0 if costs[0] <= costs[1] else 1
+        parents, children = _expand_level(*graphs[side], frontiers[side], dist[side], sigma[side], len(levels[side]))
+        levels[side].append((parents, children))
+        frontiers[side] = np.unique(children)
+        meeting = frontiers[side][dist[1-side][frontiers[side]] >= 0]
+
+    # Choose meeting node and walk back towards source and target.
+    internal = []
+    if meeting.size > 0:
+        weights = sigma[0][meeting]*sigma[1][meeting]
+        node = rng.choice(meeting, p=weights/weights.sum())
+        internal = [node] if node != source and node != target else []
+        internal += _walk_back(levels[0], sigma[0], node, dist[0][node], rng)
+        internal += _walk_back(levels[1], sigma[1], node, dist[1][node], rng)
+
+    # Reset entries of work arrays of visited nodes.
+    for side, end in enumerate((source, target)):
+        visited = np.concatenate([[end]] + [children for _, children in levels[side]])
+        dist[side][visited] = -1
+        sigma[side][visited] = 0.0
+    return internal
+
+
+def _sample_paths(task):
+    """
+    Sample shortest paths between random pairs of distinct nodes and count occurrences
+    of nodes as internal nodes of the paths (executed in worker process).
+    Author: Jernej Vivod
+
+    Args:
+        task (tuple): Number of paths to sample and seed sequence for the random number generator.
+
+    Returns:
+        (numpy.ndarray): Numbers of sampled paths each node is an internal node of.
+    """
+    num_samples, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    num_nodes = len(_indptr) - 1
+    counts = np.zeros(num_nodes, dtype=float)
+    sources = rng.integers(num_nodes, size=num_samples)
+    targets = (sources + rng.integers(1, num_nodes, size=num_samples)) % num_nodes
+    for source, target in zip(sources, targets):
+        counts[_sample_path_internal_nodes(_indptr, _indices, _rev_indptr, _rev_indices, source, target, rng, _work)] += 1.0
+    return counts
+
+
+def _deviation_bounds(estimates, log_inv_delta, omega, num_samples):
+    """
+    Compute bounds for the deviations of the estimates below and above the true values
+    that hold with the specified probabilities (KADABRA adaptive sampling bounds).
+    Author: Jernej Vivod
+
+    Args:
+        estimates (numpy.ndarray): Estimated fractions of sampled paths through nodes.
+        log_inv_delta (float): Logarithm of inverse of the probability that each bound does not hold.
+        omega (int): Maximum number of samples.
+        num_samples (int): Number of samples taken.
+
+    Returns:
+        (tuple): Bounds for the deviations below and above the true values.
+    """
+    ratio = omega/num_samples
+    lower = log_inv_delta/num_samples*(1.0/3.0 - ratio + np.sqrt((1.0/3.0 - ratio)**2 + 2.0*estimates*omega/log_inv_delta))
+    upper = log_inv_delta/num_samples*(1.0/3.0 + ratio + np.sqrt((1.0/3.0 + ratio)**2 + 2.0*estimates*omega/log_inv_delta))
+    return lower, upper
+
+
+def approximate_betweenness_centrality(graph, epsilon=0.05, delta=0.1, normalized=True, seed=None, num_workers=None):
+    """
+    Compute approximation of betweenness centrality by sampling shortest paths between
+    random pairs of nodes (Riondato-Kornaropoulos estimator with the adaptive stopping
+    rule of KADABRA). With probability at least 1 - delta, the estimates are within epsilon
+    of the betweenness values normalized by the number of ordered pairs of nodes. The samples
+    are taken in growing batches spread over worker processes and the sampling stops once
+    the deviation bounds of all nodes are below epsilon or the number of samples derived
+    from the upper bound for the vertex diameter of the graph is reached. Each path is
+    sampled using balanced bidirectional BFS. The results do not depend on the number of workers.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+        epsilon (float): Maximum additive error of the estimates.
+        delta (float): Probability that the error bound does not hold.
+        normalized (bool): Normalize values in the same way as networkx's betweenness_centrality.
+        seed (int): Seed for the random number generator.
+        num_workers (int): Number of worker processes to use. If None, use number of CPUs.
+
+    Returns:
+        (tuple): Dictionary mapping node indices to their estimated betweenness centralities
+        and number of sampled paths.
+    """
+
+    # Check if specified error bounds are valid.
+    if not 0.0 < epsilon < 1.0 or not 0.0 < delta < 1.0:
+        raise(ValueError("the epsilon and delta parameters must be between 0.0 and 1.0"))
+
+    # Get CSR representation of graph and of graph with reversed edges.
+    indptr, indices, nodes = csr.graph_to_csr(graph)
+    num_nodes = len(nodes)
+    if graph.is_directed():
+        rev_indptr, rev_indices = csr.edges_to_csr(indices, np.repeat(np.arange(num_nodes), np.diff(indptr)), num_nodes)
+    else:
+        rev_indptr, rev_indices = indptr, indices
+
+    # Compute maximum number of samples (satisfying the error bounds with probability 1 - delta/2)
+    # and logarithm of inverse probability for bounds of each node (sharing the remaining delta/2).
+    vd = _vertex_diameter_bound(indptr, indices, graph.is_directed())
+    omega = int(math.ceil((0.5/epsilon**2)*(math.floor(math.log2(max(vd-2, 1))) + 1 + math.log(2.0/delta))))
+    log_inv_delta = math.log(4.0*num_nodes/delta)
+
+    # Sample paths in growing batches until the stopping rule is satisfied.
+    counts = np.zeros(num_nodes, dtype=float)
+    num_samples = 0
+    if num_nodes > 2:
+        seed_seq = np.random.SeedSequence(seed)
+        num_workers = os.cpu_count() if num_workers is None else num_workers
+        pool = multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(indptr, indices, rev_indptr, rev_indices)) if num_workers > 1 else None
+        if pool is None:
+            _init_worker(indptr, indices, rev_indptr, rev_indices)
+        try:
+            batch_size = min(omega, max(SAMPLES_PER_TASK, omega//100))
+            while True:
+
+                # Split batch into tasks of fixed size and sum their counts.
+                sizes = [SAMPLES_PER_TASK]*(batch_size//SAMPLES_PER_TASK) + ([batch_size % SAMPLES_PER_TASK] if batch_size % SAMPLES_PER_TASK else [])
+                tasks = list(zip(sizes, seed_seq.spawn(len(sizes))))
+                counts += sum(map(_sample_paths, tasks) if pool is None else pool.imap(_sample_paths, tasks), np.zeros(num_nodes))
+                num_samples += batch_size
+
+                # Stop if maximum number of samples reached or all deviation bounds below epsilon.
+                if num_samples >= omega:
+                    break
+                lower, upper = _deviation_bounds(counts/num_samples, log_inv_delta, omega, num_samples)
+                if lower.max() <= epsilon and upper.max() <= epsilon:
+                    break
+                batch_size = min(omega - num_samples, max(SAMPLES_PER_TASK, num_samples//2))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    # Rescale estimates from fractions of ordered pairs of nodes to specified normalization.
+    res = counts/max(num_samples, 1)*num_nodes*(num_nodes-1)*rescale_factor(num_nodes, graph.is_directed(), normalized)
+
+    return dict(zip(nodes, res)), num_samples
+
+
+### TEST ###
+if __name__ == '__main__':
+    import networkx as nx
+    import parse_network
+    graph = parse_network.parse_network("../data/dolphins", create_using=nx.Graph)
+    res = betweenness_centrality(graph)
+    res_nx = nx.betweenness_centrality(graph)
+    print(max(abs(res[node] - res_nx[node]) for node in graph.nodes()))
@@ -0,0 +1,169 @@
+import os
+import multiprocessing
+import numpy as np
+import csr
+import betweenness
+import pagerank
+import shortest_paths
+
+# Supported measures.
+MEASURES = ('degree', 'pagerank', 'closeness', 'harmonic', 'eccentricity', 'betweenness')
+
+# Measures computed from the all-sources BFS sweep.
+TRAVERSAL_MEASURES = ('closeness', 'harmonic', 'eccentricity', 'betweenness')
+
+
+# CSR arrays of the graph being processed (set in each worker process).
+_indptr = None
+_indices = None
+
+
+def _init_worker(indptr, indices):
+    """
+    Store CSR arrays of the graph in the worker process so that they are
+    not sent along with each task.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+    """
+
+    global _indptr, _indices
+    _indptr = indptr
+    _indices = indices
+
+
+def _sweep_partition(task):
+    """
+    Run BFS from each source node in a partition and compute the distance-based measures of the
+    sources and the partial sums of dependencies (executed in worker process).
+    Author: Jernej Vivod
+
+    Args:
+        task (tuple): Indices of source nodes in partition and flag specifying whether to
+        accumulate dependencies.
+
+    Returns:
+        (tuple): Matrix with one row (closeness, harmonic centrality, eccentricity) per source
+        and partial (unnormalized) betweenness values of all nodes (None if not accumulated).
+    """
+    sources, with_dependencies = task
+    num_nodes = len(_indptr) - 1
+    res = np.zeros((len(sources), 3), dtype=float)
+    partial = np.zeros(num_nodes, dtype=float) if with_dependencies else None
+    for idx, source in enumerate(sources):
+
+        # Perform BFS (keeping shortest-path edges if dependencies needed).
+        if with_dependencies:
+            dist, sigma, levels = betweenness._bfs_levels(_indptr, _indices, source)
+            partial += betweenness.accumulate_dependencies(sigma, levels, source)
+        else:
+            dist = shortest_paths.bfs_distances(_indptr, _indices, source)
+
+        # Compute closeness (scaled by fraction of reachable nodes), harmonic centrality and eccentricity.
+        dist = dist[dist > 0]
+        if len(dist) > 0:
+            res[idx] = (len(dist)/dist.sum())*(len(dist)/(num_nodes - 1)), np.sum(1.0/dist), dist.max()
+    return res, partial
+
+
+def centrality_matrix(indptr, indices, measures, directed=False, normalized=True, num_workers=None, **kwargs):
+    """
+    Compute several centrality measures of nodes at once. All distance-based measures and
+    betweenness are computed from a single sweep of BFS runs from all nodes, with the sources
+    partitioned among worker processes. The values follow the conventions of the corresponding
+    networkx functions (closeness with the Wasserman-Faust scaling, unnormalized harmonic centrality
+    and eccentricity restricted to reachable nodes). For directed graphs, distances are measured
+    from each node along outgoing edges.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        measures (list): List of measures ('degree', 'pagerank', 'closeness', 'harmonic', 'eccentricity' or 'betweenness').
+        directed (bool): Whether the graph is directed (else each edge is listed in both directions).
+        normalized (bool): Normalize betweenness values in the same way as networkx's betweenness_centrality.
+        num_workers (int): Number of worker processes to use. If None, use number of CPUs.
+        **kwargs (dict): Keyword arguments for the function computing the PageRank scores.
+
+    Returns:
+        (numpy.ndarray): Matrix with one row per node and one column per measure.
+    """
+
+    # Check if specified measures valid.
+    for measure in measures:
+        if measure not in MEASURES:
+            raise(ValueError("the measures can take the values of " + ", ".join("'" + m + "'" for m in MEASURES)))
+
+    num_nodes = len(indptr) - 1
+    res = np.zeros((num_nodes, len(measures)), dtype=float)
+    columns = {measure: idx for idx, measure in enumerate(measures)}
+
+    # Compute degree centralities and PageRank scores.
+    if 'degree' in columns:
+        degrees = np.diff(indptr) + (np.bincount(indices, minlength=num_nodes) if directed else 0)
+        res[:, columns['degree']] = degrees/(num_nodes - 1) if num_nodes > 1 else 1.0
+    if 'pagerank' in columns:
+        res[:, columns['pagerank']] = pagerank.pagerank_csr(indptr, indices, **kwargs)[0]
+
+    # Perform BFS sweep if any traversal-based measure requested.
+    if any(measure in columns for measure in TRAVERSAL_MEASURES):
+        with_dependencies = 'betweenness' in columns
+        num_workers = os.cpu_count() if num_workers is None else num_workers
+
+        # Partition source nodes (interleaved to balance the work among partitions).
+        num_parts = max(1, min(num_nodes, 4*num_workers))
+        tasks = [(np.arange(idx, num_nodes, num_parts), with_dependencies) for idx in range(num_parts)]
+
+        # Compute results for partitions.
+        if num_workers == 1:
+            _init_worker(indptr, indices)
+            results = list(map(_sweep_partition, tasks))
+        else:
+            with multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(indptr, indices)) as pool:
+                results = pool.map(_sweep_partition, tasks)
+
+        # Combine results of partitions.
+        per_source = np.zeros((num_nodes, 3), dtype=float)
+        for (sources, _), (values, _) in zip(tasks, results):
+            per_source[sources] = values
+        for col, measure in enumerate(('closeness', 'harmonic', 'eccentricity')):
+            if measure in columns:
+                res[:, columns[measure]] = per_source[:, col]
+        if with_dependencies:
+            dependencies = sum((partial for _, partial in results), np.zeros(num_nodes))
+            res[:, columns['betweenness']] = dependencies*betweenness.rescale_factor(num_nodes, directed, normalized)
+
+    return res
+
+
+def centralities(graph, measures, normalized=True, num_workers=None, **kwargs):
+    """
+    Compute several centrality measures of nodes in graph at once (see centrality_matrix).
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+        measures (list): List of measures ('degree', 'pagerank', 'closeness', 'harmonic', 'eccentricity' or 'betweenness').
+        normalized (bool): Normalize betweenness values in the same way as networkx's betweenness_centrality.
+        num_workers (int): Number of worker processes to use. If None, use number of CPUs.
+        **kwargs (dict): Keyword arguments for the function computing the PageRank scores.
+
+    Returns:
+        (tuple): Matrix with one row per node and one column per measure and list of nodes
+        where the node at position i in the list corresponds to row i.
+    """
+    indptr, indices, nodes = csr.graph_to_csr(graph)
+    return centrality_matrix(indptr, indices, measures, graph.is_directed(), normalized, num_workers, **kwargs), nodes
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    import random_graphs
+    indptr, indices = random_graphs.gnm(2000, 10000, seed=0)
+    start = time.time()
+    res = centrality_matrix(indptr, indices, MEASURES)
+    print("Computed {0} measures in {1:.2f}s".format(len(MEASURES), time.time() - start))
+    print(np.corrcoef(res, rowvar=False).round(3))
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def graph_to_csr(graph):
+    """
+    Convert graph to compressed sparse row (CSR) adjacency arrays.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+
+    Returns:
+        (tuple): Array of row pointers, array of neighbor indices and list of nodes
+        where the node at position i in the list corresponds to row i.
+    """
+
+    # Map nodes to consecutive integer indices.
+    nodes = list(graph.nodes())
+    node_to_idx = {node: idx for idx, node in enumerate(nodes)}
+
+    # Get edges as arrays of source and target indices.
+    edges = np.array([(node_to_idx[u], node_to_idx[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+    src, dst = edges[:, 0], edges[:, 1]
+
+    # If graph undirected, add each edge in both directions.
+    if not graph.is_directed():
+        src, dst = np.concatenate((src, dst)), np.concatenate((dst, src))
+
+    return edges_to_csr(src, dst, len(nodes)) + (nodes,)
+
+
+def edges_to_csr(src, dst, num_nodes):
+    """
+    Construct CSR adjacency arrays from arrays of edge endpoints.
+    Author: Jernej Vivod
+
+    Args:
+        src (numpy.ndarray): Array of edge source indices.
+        dst (numpy.ndarray): Array of edge target indices.
+        num_nodes (int): Number of nodes in the graph.
+
+    Returns:
+        (tuple): Array of row pointers and array of neighbor indices (sorted within each row).
+    """
+
+    # Sort edges by source and then by target (using a single combined key).
+    keys = np.sort(np.asarray(src, dtype=np.int64)*num_nodes + np.asarray(dst, dtype=np.int64))
+
+    # Compute row pointers from out-degrees.
+    indptr = np.zeros(num_nodes+1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=num_nodes), out=indptr[1:])
+
+    return indptr, keys % num_nodes
@@ -0,0 +1,162 @@
+import numpy as np
+
+
+def graph_to_edges(graph):
+    """
+    Get edges of graph as arrays of source and target indices.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+
+    Returns:
+        (tuple): Array of source indices, array of target indices and list of nodes
+        where the node at position i in the list corresponds to index i.
+    """
+    nodes = list(graph.nodes())
+    node_to_idx = {node: idx for idx, node in enumerate(nodes)}
+    edges = np.array([(node_to_idx[u], node_to_idx[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+    return edges[:, 0], edges[:, 1], nodes
+
+
+def degree_histograms(src, dst, num_nodes):
+    """
+    Compute histograms of degrees, in-degrees and out-degrees of nodes from arrays of edge
+    endpoints. The degree of a node is the sum of its in-degree and out-degree (so for undirected
+    graphs with each edge listed once, the degree histogram is the usual one).
+    Author: Jernej Vivod
+
+    Args:
+        src (numpy.ndarray): Array of edge source indices.
+        dst (numpy.ndarray): Array of edge target indices.
+        num_nodes (int): Number of nodes in the graph.
+
+    Returns:
+        (tuple): Histograms of degrees, in-degrees and out-degrees where the element at
+        index k is the number of nodes with degree k.
+    """
+    out_degrees = np.bincount(src, minlength=num_nodes)
+    in_degrees = np.bincount(dst, minlength=num_nodes)
+    return np.bincount(in_degrees + out_degrees), np.bincount(in_degrees), np.bincount(out_degrees)
+
+
+def degree_histograms_stream(edges, num_nodes=None):
+    """
+    Compute histograms of degrees, in-degrees and out-degrees of nodes in a pass over a stream
+    of edge chunks. Only the per-node degree counters are kept in memory.
+    Author: Jernej Vivod
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges (e.g. sampling.read_edge_chunks).
+        num_nodes (int): Number of nodes in the graph. If None, the largest index in the stream plus one is used.
+
+    Returns:
+        (tuple): Histograms of degrees, in-degrees and out-degrees where the element at
+        index k is the number of nodes with degree k.
+    """
+    out_degrees = np.zeros(num_nodes or 0, dtype=np.int64)
+    in_degrees = np.zeros(num_nodes or 0, dtype=np.int64)
+    for src, dst in edges():
+
+        # Count degrees in chunk and add to counters (growing them if needed).
+        out_chunk, in_chunk = np.bincount(src), np.bincount(dst)
+        size = max(len(out_degrees), len(out_chunk), len(in_chunk))
+        out_degrees = np.pad(out_degrees, (0, size - len(out_degrees)))
+        in_degrees = np.pad(in_degrees, (0, size - len(in_degrees)))
+        out_degrees[:len(out_chunk)] += out_chunk
+        in_degrees[:len(in_chunk)] += in_chunk
+
+    return np.bincount(in_degrees + out_degrees), np.bincount(in_degrees), np.bincount(out_degrees)
+
+
+def graph_degree_histograms(graph):
+    """
+    Compute histograms of degrees, in-degrees and out-degrees of nodes in graph.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+
+    Returns:
+        (tuple): Histograms of degrees, in-degrees and out-degrees where the element at
+        index k is the number of nodes with degree k.
+    """
+    src, dst, nodes = graph_to_edges(graph)
+    return degree_histograms(src, dst, len(nodes))
+
+
+def pmf(hist):
+    """
+    Compute probability mass function of degrees from degree histogram.
+    Author: Jernej Vivod
+
+    Args:
+        hist (numpy.ndarray): Degree histogram.
+
+    Returns:
+        (tuple): Array of degrees with non-zero probability and array of their probabilities.
+    """
+    degrees = np.flatnonzero(hist)
+    return degrees, hist[degrees]/hist.sum()
+
+
+def ccdf(hist):
+    """
+    Compute complementary cumulative distribution function P(K >= k) of degrees from degree histogram.
+    Author: Jernej Vivod
+
+    Args:
+        hist (numpy.ndarray): Degree histogram.
+
+    Returns:
+        (tuple): Array of degrees with non-zero probability and array of probabilities that
+        a node has at least the corresponding degree.
+    """
+    tail = np.cumsum(hist[::-1])[::-1]
+    degrees = np.flatnonzero(hist)
+    return degrees, tail[degrees]/tail[0]
+
+
+def log_binned(hist, bins_per_decade=10):
+    """
+    Compute logarithmically binned degree density from degree histogram. The fraction of nodes
+    in each bin is divided by the number of integer degrees in the bin. Nodes with degree 0 are
+    counted in the normalization but are not binned.
+    Author: Jernej Vivod
+
+    Args:
+        hist (numpy.ndarray): Degree histogram.
+        bins_per_decade (int): Number of bins per decade of degrees.
+
+    Returns:
+        (tuple): Array of bin centers (geometric means of smallest and largest degree in bin)
+        and array of densities of non-empty bins.
+    """
+
+    # Compute integer bin edges.
+    max_degree = len(hist) - 1
+    if max_degree < 1:
+        return np.zeros(0), np.zeros(0)
+    num_edges = int(np.ceil(np.log10(max_degree + 1)*bins_per_decade)) + 1
+    edges = np.unique(np.floor(np.logspace(0, np.log10(max_degree + 1), num_edges)).astype(np.int64))
+    edges[-1] = max_degree + 1
+
+    # Sum histogram within bins and normalize by number of nodes and bin widths.
+    counts = np.add.reduceat(hist, edges[:-1])
+    widths = np.diff(edges)
+    centers = np.sqrt(edges[:-1]*(edges[1:] - 1))
+    nonempty = counts > 0
+    return centers[nonempty], counts[nonempty]/(hist.sum()*widths[nonempty])
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    rng = np.random.default_rng(0)
+    num_nodes = 10**6
+    src = rng.integers(num_nodes, size=10**7)
+    dst = np.minimum(rng.zipf(2.2, size=10**7) - 1, num_nodes - 1)
+    start = time.time()
+    hist, in_hist, out_hist = degree_histograms(src, dst, num_nodes)
+    centers, density = log_binned(in_hist)
+    print("Computed histograms in {0:.2f}s ({1} in-degree bins)".format(time.time() - start, len(centers)))
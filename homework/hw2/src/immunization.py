@@ -0,0 +1,116 @@
+import numpy as np
+
+# Maximum number of elements of the (runs x nodes) matrices processed at once.
+MAX_BATCH_ELEMENTS = 2**24
+
+
+def _sample_rows(rng, num_runs, num_nodes, num_to_sample, weights=None):
+    """
+    Sample specified number of distinct nodes in each run. If weights are specified, the nodes
+    with the highest weights are selected and ties are broken randomly.
+    Author: Jernej Vivod
+
+    Args:
+        rng (numpy.random.Generator): Random number generator.
+        num_runs (int): Number of runs.
+        num_nodes (int): Number of nodes.
+        num_to_sample (int): Number of nodes to sample in each run.
+        weights (numpy.ndarray): Integer weights of nodes. If None, nodes are sampled uniformly.
+
+    Returns:
+        (numpy.ndarray): Matrix of sampled nodes with one row per run.
+    """
+    if num_to_sample <= 0:
+        return np.zeros((num_runs, 0), dtype=np.int64)
+    keys = rng.random((num_runs, num_nodes))
+    if weights is not None:
+        keys -= weights
+    return np.argpartition(keys, num_to_sample-1, axis=1)[:, :num_to_sample]
+
+
+def mark_nodes(indptr, indices, scheme, num_to_mark, num_runs, rng):
+    """
+    Mark nodes in each run according to the specified scheme. The 'random' scheme marks random
+    nodes, the 'acquaintance' scheme marks a random neighbor of each of the randomly selected nodes
+    (nodes without neighbors mark nothing) and the 'degree' scheme marks the nodes with highest degrees.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        scheme (str): Marking scheme ('random', 'acquaintance' or 'degree').
+        num_to_mark (int): Number of nodes to mark (or select for the acquaintance scheme) in each run.
+        num_runs (int): Number of runs.
+        rng (numpy.random.Generator): Random number generator.
+
+    Returns:
+        (numpy.ndarray): Boolean matrix with one row per run marking the marked nodes.
+    """
+
+    # Check if specified scheme valid.
+    if scheme not in {'random', 'acquaintance', 'degree'}:
+        raise(ValueError("the scheme parameter can take the values of 'random', 'acquaintance' or 'degree'"))
+
+    # Select nodes in each run.
+    num_nodes = len(indptr) - 1
+    degrees = np.diff(indptr)
+    selected = _sample_rows(rng, num_runs, num_nodes, num_to_mark, degrees if scheme == 'degree' else None)
+
+    # For acquaintance scheme, select random neighbor of each selected node.
+    rows = np.repeat(np.arange(num_runs), selected.shape[1])
+    selected = selected.ravel()
+    if scheme == 'acquaintance':
+        deg = degrees[selected]
+        has_neighbors = deg > 0
+        rows, selected, deg = rows[has_neighbors], selected[has_neighbors], deg[has_neighbors]
+        offsets = np.minimum((rng.random(len(selected))*deg).astype(np.int64), deg-1)
+        selected = indices[indptr[selected] + offsets]
+
+    # Construct mask of marked nodes.
+    marked = np.zeros((num_runs, num_nodes), dtype=bool)
+    marked[rows, selected] = True
+    return marked
+
+
+def immunization_scores(indptr, indices, scheme, frac_to_mark, num_runs, seed=None):
+    """
+    Compute sum of squared degrees of unmarked nodes normalized by the number of nodes for each
+    run of the specified marking scheme. The runs are processed in batches as matrix operations.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        scheme (str): Marking scheme ('random', 'acquaintance' or 'degree').
+        frac_to_mark (float): Fraction of nodes to mark.
+        num_runs (int): Number of runs.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (numpy.ndarray): Scores of runs.
+    """
+    rng = np.random.default_rng(seed)
+    num_nodes = len(indptr) - 1
+    num_to_mark = int(round(num_nodes*frac_to_mark))
+    squared_degrees = np.diff(indptr).astype(np.float64)**2/num_nodes
+    batch_size = max(1, MAX_BATCH_ELEMENTS//max(num_nodes, 1))
+
+    # Go over batches of runs and compute scores as matrix-vector products.
+    scores = []
+    for start in range(0, num_runs, batch_size):
+        marked = mark_nodes(indptr, indices, scheme, num_to_mark, min(batch_size, num_runs - start), rng)
+        scores.append(squared_degrees.sum() - marked.dot(squared_degrees))
+    return np.concatenate(scores) if scores else np.zeros(0)
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    import csr
+    rng = np.random.default_rng(0)
+    num_nodes = 10**5
+    src, dst = rng.integers(num_nodes, size=5*10**5), rng.integers(num_nodes, size=5*10**5)
+    indptr, indices = csr.edges_to_csr(np.concatenate((src, dst)), np.concatenate((dst, src)), num_nodes)
+    start = time.time()
+    scores = immunization_scores(indptr, indices, 'acquaintance', 0.1, 1000, seed=0)
+    print("Performed {0} runs in {1:.2f}s (mean score {2:.4f})".format(len(scores), time.time() - start, scores.mean()))
@@ -0,0 +1,306 @@
+import collections
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+import csr
+
+
+def transition_matrix(indptr, indices, dtype=np.float64):
+    """
+    Construct column-stochastic transition matrix of the random walk on the graph.
+    Columns of dangling nodes (nodes with no outgoing edges) are left empty.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        dtype (type): Data type of the matrix values.
+
+    Returns:
+        (tuple): Transition matrix in CSR format where element (j, i) is the probability
+        of moving from node i to node j and boolean array marking dangling nodes.
+    """
+
+    # Compute out-degrees and mark dangling nodes.
+    num_nodes = len(indptr) - 1
+    out_degrees = np.diff(indptr)
+    dangling = out_degrees == 0
+
+    # Construct row-stochastic adjacency matrix and transpose it.
+    inv_out_degrees = np.zeros(num_nodes, dtype=dtype)
+    inv_out_degrees[~dangling] = 1.0/out_degrees[~dangling]
+    adj = sp.csr_matrix((np.repeat(inv_out_degrees, out_degrees), indices, indptr), shape=(num_nodes, num_nodes))
+    return adj.T.tocsr(), dangling
+
+
+def pagerank_csr(indptr, indices, alpha=0.85, personalization=None, x0=None, tol=1.0e-6, max_iter=100, method='power', dtype=np.float64):
+    """
+    Compute PageRank scores of nodes of graph given by CSR arrays. The random walk
+    jumps from dangling nodes according to the personalization vector.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        alpha (float): Damping factor.
+        personalization (numpy.ndarray): Teleportation distribution. If None, use uniform distribution.
+        x0 (numpy.ndarray): Starting vector (e.g. previous solution). If None, use uniform vector.
+        tol (float): Convergence tolerance. Iteration stops when the L1 norm of the change
+        is below number of nodes times tol.
+        max_iter (int): Maximum number of iterations.
+        method (str): Iterative method to use ('power' or 'gauss-seidel').
+        dtype (type): Data type used in the computations (e.g. numpy.float32).
+
+    Returns:
+        (tuple): Array of PageRank scores, number of performed iterations and L1 norm
+        of the change in the last iteration.
+    """
+
+    # Check if specified method valid.
+    if method not in {'power', 'gauss-seidel'}:
+        raise(ValueError("the method parameter can take the values of 'power' or 'gauss-seidel'"))
+
+    # Get transition matrix and normalized personalization and starting vectors.
+    num_nodes = len(indptr) - 1
+    trans, dangling = transition_matrix(indptr, indices, dtype=dtype)
+    p = np.full(num_nodes, 1.0/num_nodes, dtype=dtype) if personalization is None else np.asarray(personalization, dtype=dtype)/np.sum(personalization)
+    x = np.full(num_nodes, 1.0/num_nodes, dtype=dtype) if x0 is None else np.asarray(x0, dtype=dtype)/np.sum(x0)
+
+    if method == 'power':
+
+        # Perform power iteration.
+        for num_iter in range(1, max_iter+1):
+            x_last = x
+            x = alpha*(trans.dot(x_last) + np.sum(x_last[dangling])*p) + (1.0 - alpha)*p
+            err = np.abs(x - x_last).sum()
+            if err < num_nodes*tol:
+                break
+        return x, num_iter, err
+
+    else:
+
+        # Solve (I - alpha*trans)y = p using Gauss-Seidel iteration. The PageRank
+        # vector is the solution normalized to unit sum.
+        system = sp.identity(num_nodes, dtype=dtype, format='csr') - alpha*trans
+        lower = sp.tril(system, format='csr')
+        upper = sp.triu(system, k=1, format='csr')
+        y = x/(1.0 - alpha)
+        for num_iter in range(1, max_iter+1):
+            x_last = x
+            y = spla.spsolve_triangular(lower, p - upper.dot(y), lower=True).astype(dtype)
+            x = y/np.sum(y)
+            err = np.abs(x - x_last).sum()
+            if err < num_nodes*tol:
+                break
+        return x, num_iter, err
+
+
+def pagerank(graph, alpha=0.85, personalization=None, nstart=None, tol=1.0e-6, max_iter=100, method='power', dtype=np.float64):
+    """
+    Compute PageRank scores of nodes in graph using a sparse transition matrix.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+        alpha (float): Damping factor.
+        personalization (dict): Dictionary mapping node indices to teleportation weights.
+        Missing nodes have weight 0. If None, use uniform teleportation.
+        nstart (dict): Dictionary mapping node indices to starting values (e.g. previous solution).
+        tol (float): Convergence tolerance.
+        max_iter (int): Maximum number of iterations.
+        method (str): Iterative method to use ('power' or 'gauss-seidel').
+        dtype (type): Data type used in the computations (e.g. numpy.float32).
+
+    Returns:
+        (tuple): Dictionary mapping node indices to their PageRank scores, number of performed
+        iterations and L1 norm of the change in the last iteration.
+    """
+
+    # Get CSR representation of graph.
+    indptr, indices, nodes = csr.graph_to_csr(graph)
+
+    # Convert personalization and starting values to arrays.
+    p = None if personalization is None else np.array([personalization.get(node, 0.0) for node in nodes])
+    x0 = None if nstart is None else np.array([nstart.get(node, 0.0) for node in nodes])
+
+    # Compute PageRank scores.
+    x, num_iter, err = pagerank_csr(indptr, indices, alpha, p, x0, tol, max_iter, method, dtype)
+    return dict(zip(nodes, x)), num_iter, err
+
+
+class DynamicPageRank:
+    """
+    PageRank scores maintained under edge insertions and deletions. The estimates p and
+    residuals r satisfy (I - alpha*P)x = (I - alpha*P)p + r where x is the exact PageRank
+    vector and P the transition matrix (dangling nodes jump uniformly). A change of the
+    out-neighbors of a node only changes the residuals of its old and new neighbors, which
+    are then pushed locally until they fall below eps times the out-degree of the node.
+    The set of nodes is fixed.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the initial graph.
+        alpha (float): Damping factor.
+        eps (float): Residual threshold per unit of out-degree.
+    """
+
+    def __init__(self, graph, alpha=0.85, eps=1.0e-9):
+        self.alpha = alpha
+        self.eps = eps
+        self.directed = graph.is_directed()
+
+        # Store out-neighbor sets of nodes.
+        indptr, indices, self.nodes = csr.graph_to_csr(graph)
+        self.node_to_idx = {node: idx for idx, node in enumerate(self.nodes)}
+        self.out_neighbors = [set(indices[indptr[idx]:indptr[idx+1]]) for idx in range(len(self.nodes))]
+        self.out_degrees = np.diff(indptr)
+
+        # Compute initial estimates and their exact residuals.
+        num_nodes = len(self.nodes)
+        trans, dangling = transition_matrix(indptr, indices)
+        self.estimate, _, _ = pagerank_csr(indptr, indices, alpha=alpha, tol=eps)
+        self.residual = (1.0 - alpha)/num_nodes + alpha*(trans.dot(self.estimate) + np.sum(self.estimate[dangling])/num_nodes) - self.estimate
+
+        # Residual spread uniformly over all nodes (from pushes at dangling nodes).
+        self.uniform_residual = 0.0
+
+        # Push residuals exceeding the threshold.
+        self._push(np.flatnonzero(np.abs(self.residual) > eps*np.maximum(self.out_degrees, 1)))
+
+
+    def _column_change(self, idx, neighbors, sign):
+        """
+        Add or subtract contribution of column of transition matrix of node to the residuals.
+        Author: Jernej Vivod
+
+        Args:
+            idx (int): Index of node.
+            neighbors (numpy.ndarray): Out-neighbors of node defining the column.
+            sign (float): 1.0 to add the contribution, -1.0 to subtract it.
+        """
+        mass = sign*self.alpha*self.estimate[idx]
+        if len(neighbors) == 0:
+            self.uniform_residual += mass
+        else:
+            self.residual[neighbors] += mass/len(neighbors)
+
+
+    def _push(self, candidates):
+        """
+        Push residuals of candidate nodes and of nodes whose residuals exceed the threshold
+        as a result. Resolve the uniform residual by rescaling the estimates.
+        Author: Jernej Vivod
+
+        Args:
+            candidates (numpy.ndarray): Indices of nodes whose residuals may exceed the threshold.
+        """
+
+        # Push residuals of nodes in queue.
+        queue = collections.deque(candidates)
+        in_queue = set(candidates)
+        while len(queue) > 0:
+            idx = queue.popleft()
+            in_queue.discard(idx)
+            res = self.residual[idx]
+            if abs(res) <= self.eps*max(self.out_degrees[idx], 1):
+                continue
+
+            # Move residual to estimate and spread it among out-neighbors.
+            self.estimate[idx] += res
+            self.residual[idx] = 0.0
+            neighbors = np.fromiter(self.out_neighbors[idx], dtype=np.int64, count=self.out_degrees[idx])
+            if len(neighbors) == 0:
+                self.uniform_residual += self.alpha*res
+                continue
+            self.residual[neighbors] += self.alpha*res/len(neighbors)
+
+            # Add neighbors whose residuals exceed the threshold to queue.
+            for neigh in neighbors[np.abs(self.residual[neighbors]) > self.eps*np.maximum(self.out_degrees[neighbors], 1)]:
+                if neigh not in in_queue:
+                    in_queue.add(neigh)
+                    queue.append(neigh)
+
+        # Rescaling the estimates by 1 + c cancels uniform residual t if c = t/(1 - alpha - t).
+        if self.uniform_residual != 0.0:
+            scale = 1.0 + self.uniform_residual/(1.0 - self.alpha - self.uniform_residual)
+            self.estimate *= scale
+            self.residual *= scale
+            self.uniform_residual = 0.0
+
+
+    def update(self, insertions=(), deletions=()):
+        """
+        Update PageRank scores after inserting and deleting edges.
+        Author: Jernej Vivod
+
+        Args:
+            insertions (list): List of inserted edges (pairs of node indices).
+            deletions (list): List of deleted edges (pairs of node indices).
+        """
+
+        # Get changes of out-neighbor sets.
+        changes = [(u, v, True) for u, v in insertions] + [(u, v, False) for u, v in deletions]
+        if not self.directed:
+            changes += [(v, u, ins) for u, v, ins in changes]
+
+        # Store previous out-neighbors of affected nodes.
+        affected = {self.node_to_idx[u] for u, _, _ in changes}
+        old_neighbors = {idx: np.fromiter(self.out_neighbors[idx], dtype=np.int64) for idx in affected}
+
+        # Apply changes.
+        for u, v, ins in changes:
+            if ins:
+                self.out_neighbors[self.node_to_idx[u]].add(self.node_to_idx[v])
+            else:
+                self.out_neighbors[self.node_to_idx[u]].discard(self.node_to_idx[v])
+
+        # Replace old columns of transition matrix by new ones in the residuals.
+        candidates = set()
+        for idx in affected:
+            new_neighbors = np.fromiter(self.out_neighbors[idx], dtype=np.int64)
+            self.out_degrees[idx] = len(new_neighbors)
+            self._column_change(idx, old_neighbors[idx], -1.0)
+            self._column_change(idx, new_neighbors, 1.0)
+            candidates.update(old_neighbors[idx])
+            candidates.update(new_neighbors)
+            candidates.add(idx)
+
+        # Push residuals.
+        self._push(np.fromiter(candidates, dtype=np.int64))
+
+
+    def error_bound(self):
+        """
+        Get upper bound for the L1 distance between the estimates and the exact PageRank scores.
+        Author: Jernej Vivod
+
+        Returns:
+            (float): Upper bound for the L1 error.
+        """
+        return (np.abs(self.residual).sum() + abs(self.uniform_residual))/(1.0 - self.alpha)
+
+
+    def scores(self):
+        """
+        Get current PageRank scores.
+        Author: Jernej Vivod
+
+        Returns:
+            (dict): Dictionary mapping node indices to their PageRank scores.
+        """
+        return dict(zip(self.nodes, self.estimate))
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    import networkx as nx
+    for path in ('../data/java', '../data/lucene'):
+        graph = nx.read_edgelist(path, create_using=nx.DiGraph)
+        start = time.time()
+        res, num_iter, err = pagerank(graph)
+        print("{0}: {1:.4f}s ({2} iterations, error {3:.2e})".format(path, time.time() - start, num_iter, err))
+        start = time.time()
+        res_nx = nx.pagerank(graph)
+        print("{0} (networkx): {1:.4f}s".format(path, time.time() - start))
+        print(max(abs(res[node] - res_nx[node]) for node in graph.nodes()))
@@ -0,0 +1,207 @@
+import os
+import multiprocessing
+import numpy as np
+
+# Maximum number of elements of the (candidates x values) matrices processed at once.
+MAX_BATCH_ELEMENTS = 2**22
+
+# Number of smallest values of the power-law tail of synthetic datasets sampled as a histogram.
+NUM_TAIL_CATEGORIES = 2**16
+
+
+def degree_histogram(degrees):
+    """
+    Get distinct positive degrees and their counts.
+    Author: Jernej Vivod
+
+    Args:
+        degrees (numpy.ndarray): Array of node degrees.
+
+    Returns:
+        (tuple): Sorted array of distinct positive degrees and array of their counts.
+    """
+    hist = np.bincount(np.asarray(degrees, dtype=np.int64))
+    values = np.flatnonzero(hist)
+    values = values[values >= 1]
+    return values, hist[values]
+
+
+def scan_xmin(values, counts, max_xmin=None):
+    """
+    Fit discrete power law to the tail of the data for every candidate x_min and select the fit
+    with the smallest Kolmogorov-Smirnov distance (Clauset, Shalizi and Newman). The exponent for
+    each candidate is the approximate maximum-likelihood estimate 1 + n/sum(ln(x/(x_min - 0.5)))
+    computed from cumulative sums over the sorted data. The model tail distribution is
+    P(X >= x) = ((x - 0.5)/(x_min - 0.5))^(1 - alpha).
+    Author: Jernej Vivod
+
+    Args:
+        values (numpy.ndarray): Sorted array of distinct positive values.
+        counts (numpy.ndarray): Array of counts of values.
+        max_xmin (int): Largest candidate x_min. If None, all values except the largest are candidates.
+
+    Returns:
+        (tuple): Estimated exponent, x_min, Kolmogorov-Smirnov distance and number of values in the tail.
+    """
+
+    # Compute number of values and sum of their logarithms in tail starting at each value.
+    values = np.asarray(values, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.float64)
+    tail = np.cumsum(counts[::-1])[::-1]
+    log_sums = np.cumsum((counts*np.log(values))[::-1])[::-1]
+
+    # Compute exponent estimates for candidates.
+    num_candidates = max(len(values) - 1, 1)
+    if max_xmin is not None:
+        num_candidates = max(min(num_candidates, np.searchsorted(values, max_xmin, side='right')), 1)
+    log_below = np.log(values - 0.5)
+    alphas = 1 + tail[:num_candidates]/(log_sums[:num_candidates] - tail[:num_candidates]*log_below[:num_candidates])
+
+    # Compute Kolmogorov-Smirnov distances in batches of candidates. The empirical tail distribution
+    # is compared to the model at each value and at the next integer (where the empirical one drops).
+    log_above = np.log(values + 0.5)
+    tail_next = np.append(tail[1:], 0.0)
+    ks = np.empty(num_candidates)
+    batch_size = max(1, MAX_BATCH_ELEMENTS//len(values))
+    for start in range(0, num_candidates, batch_size):
+        rows = np.arange(start, min(start + batch_size, num_candidates))
+        exponents = (1 - alphas[rows])[:, np.newaxis]
+        model_at = np.exp(exponents*np.maximum(log_below[np.newaxis, :] - log_below[rows, np.newaxis], 0.0))
+        model_next = np.exp(exponents*np.maximum(log_above[np.newaxis, :] - log_below[rows, np.newaxis], 0.0))
+        dist = np.maximum(np.abs(tail[np.newaxis, :] - tail[rows, np.newaxis]*model_at),
+                np.abs(tail_next[np.newaxis, :] - tail[rows, np.newaxis]*model_next))/tail[rows, np.newaxis]
+        dist[np.arange(len(values))[np.newaxis, :] < rows[:, np.newaxis]] = 0.0
+        ks[rows] = dist.max(axis=1)
+
+    best = np.argmin(ks)
+    return alphas[best], int(values[best]), ks[best], int(tail[best])
+
+
+def fit_power_law(degrees, max_xmin=None):
+    """
+    Fit discrete power law to degrees, selecting x_min by the Kolmogorov-Smirnov distance.
+    Degrees equal to 0 are ignored.
+    Author: Jernej Vivod
+
+    Args:
+        degrees (numpy.ndarray): Array of node degrees.
+        max_xmin (int): Largest candidate x_min. If None, all degrees except the largest are candidates.
+
+    Returns:
+        (tuple): Estimated exponent, x_min, Kolmogorov-Smirnov distance and number of degrees in the tail.
+    """
+    values, counts = degree_histogram(degrees)
+    if len(values) == 0:
+        raise(ValueError("at least one positive degree required"))
+    return scan_xmin(values, counts, max_xmin)
+
+
+def _synthetic_histogram(rng, values, counts, alpha, xmin, num_tail):
+    """
+    Sample synthetic dataset of the same size as the data. Each value is drawn from the fitted power
+    law with probability equal to the fraction of data in the tail and otherwise uniformly from the data
+    below x_min. The smallest values of the power-law part are sampled as a multinomial histogram
+    and only the remaining values are drawn individually.
+    Author: Jernej Vivod
+
+    Args:
+        rng (numpy.random.Generator): Random number generator.
+        values (numpy.ndarray): Sorted array of distinct positive values in the data.
+        counts (numpy.ndarray): Array of counts of values.
+        alpha (float): Fitted exponent.
+        xmin (int): Fitted x_min.
+        num_tail (int): Number of values in the tail.
+
+    Returns:
+        (tuple): Sorted array of distinct values in the synthetic dataset and array of their counts.
+    """
+
+    # Sample number of values from the power law and histogram of values below x_min.
+    num_total = int(counts.sum())
+    num_power = rng.binomial(num_total, num_tail/num_total)
+    below = values < xmin
+    counts_below = rng.multinomial(num_total - num_power, counts[below]/counts[below].sum()) if below.any() else np.zeros(0, dtype=np.int64)
+
+    # Sample histogram of smallest values of the power law (last category is the rest of the tail).
+    support = np.arange(xmin, xmin + NUM_TAIL_CATEGORIES + 1)
+    tail_probs = ((support - 0.5)/(xmin - 0.5))**(1 - alpha)
+    counts_power = rng.multinomial(num_power, np.append(-np.diff(tail_probs), tail_probs[-1]))
+
+    # Draw remaining values from the power law conditioned on exceeding the sampled support.
+    rest = (support[-1] - 0.5)*(1 - rng.random(counts_power[-1]))**(-1/(alpha - 1))
+    rest = np.sort(np.floor(np.minimum(rest, 2.0**62) + 0.5).astype(np.int64))
+    rest_start = np.concatenate(([True], rest[1:] != rest[:-1])) if len(rest) > 0 else np.zeros(0, dtype=bool)
+    rest_values = rest[rest_start]
+    rest_counts = np.diff(np.append(np.flatnonzero(rest_start), len(rest)))
+
+    # Combine histograms and remove values with zero counts.
+    res_values = np.concatenate((values[below], support[:-1], rest_values))
+    res_counts = np.concatenate((counts_below, counts_power[:-1], rest_counts))
+    nonzero = res_counts > 0
+    return res_values[nonzero], res_counts[nonzero]
+
+
+def _bootstrap_distance(task):
+    """
+    Sample synthetic dataset, fit it and return the Kolmogorov-Smirnov distance of the fit.
+    Author: Jernej Vivod
+
+    Args:
+        task (tuple): Values, counts, exponent, x_min and tail size of the fit, largest candidate x_min
+        and seed sequence for the synthetic dataset.
+
+    Returns:
+        (float): Kolmogorov-Smirnov distance of the fit to the synthetic dataset.
+    """
+    values, counts, alpha, xmin, num_tail, max_xmin, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    return scan_xmin(*_synthetic_histogram(rng, values, counts, alpha, xmin, num_tail), max_xmin=max_xmin)[2]
+
+
+def power_law_test(degrees, num_samples=1000, max_xmin=None, seed=None, num_workers=None):
+    """
+    Fit discrete power law to degrees and compute the p-value of the fit by the semi-parametric
+    bootstrap of Clauset, Shalizi and Newman. The p-value is the fraction of synthetic datasets whose
+    fits have a Kolmogorov-Smirnov distance at least as large as the fit to the data. The synthetic
+    datasets are fitted in parallel and each uses its own child of the root seed sequence so the
+    results do not depend on the number of workers.
+    Author: Jernej Vivod
+
+    Args:
+        degrees (numpy.ndarray): Array of node degrees.
+        num_samples (int): Number of synthetic datasets.
+        max_xmin (int): Largest candidate x_min. If None, all degrees except the largest are candidates.
+        seed (int): Root seed (any entropy accepted by numpy.random.SeedSequence).
+        num_workers (int): Number of worker processes to use. If None, use number of CPUs.
+
+    Returns:
+        (tuple): Estimated exponent, x_min, Kolmogorov-Smirnov distance and p-value.
+    """
+
+    # Fit power law to data.
+    values, counts = degree_histogram(degrees)
+    if len(values) == 0:
+        raise(ValueError("at least one positive degree required"))
+    alpha, xmin, ks, num_tail = scan_xmin(values, counts, max_xmin)
+
+    # Fit synthetic datasets.
+    tasks = [(values, counts, alpha, xmin, num_tail, max_xmin, seed_seq) for seed_seq in np.random.SeedSequence(seed).spawn(num_samples)]
+    num_workers = os.cpu_count() if num_workers is None else num_workers
+    if num_workers == 1 or num_samples <= 1:
+        distances = [_bootstrap_distance(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(min(num_workers, num_samples)) as pool:
+            distances = pool.map(_bootstrap_distance, tasks, chunksize=max(1, num_samples//(4*num_workers)))
+
+    p_value = np.mean(np.array(distances) >= ks) if num_samples > 0 else np.nan
+    return alpha, xmin, ks, p_value
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    rng = np.random.default_rng(0)
+    degrees = np.floor(0.5*(1 - rng.random(10**6))**(-1/1.5) + 0.5).astype(np.int64)
+    start = time.time()
+    alpha, xmin, ks, p_value = power_law_test(degrees, num_samples=100, seed=0)
+    print("alpha={0:.3f}, x_min={1}, KS={2:.4f}, p={3:.2f} ({4:.2f}s)".format(alpha, xmin, ks, p_value, time.time() - start))
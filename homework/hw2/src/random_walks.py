@@ -0,0 +1,124 @@
+import numpy as np
+
+# Number of buffered traversed edges (in addition to twice the number of distinct
+# edges found so far) after which duplicates are removed.
+EDGE_BUFFER_SIZE = 2**22
+
+
+def _unique_edges(keys):
+    """
+    Remove duplicate edge keys.
+    Author: Jernej Vivod
+
+    Args:
+        keys (list): List of arrays of edge keys.
+
+    Returns:
+        (numpy.ndarray): Sorted array of distinct edge keys.
+    """
+    if not keys:
+        return np.zeros(0, dtype=np.int64)
+    keys = np.sort(np.concatenate(keys))
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+def random_walks(indptr, indices, starts, frac_cover=None, max_steps=None, restart_prob=0.0, seed=None):
+    """
+    Perform random walks with many walkers at once. In each step every walker moves to a
+    uniformly selected neighbor (the neighbor at offset indptr[v] + floor(u*deg(v)) for
+    uniform u) or, with the restart probability, returns to its starting node. Walkers at
+    nodes without neighbors also return to their starting nodes. The walks stop when the
+    specified fraction of nodes is covered or when each walker made the maximum number of steps.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        starts (numpy.ndarray): Starting nodes of walkers (one walker per element).
+        frac_cover (float): Fraction of nodes to cover. If None, walk until the step budget is spent.
+        max_steps (int): Maximum number of steps of each walker. If None, walk until the nodes are covered.
+        restart_prob (float): Probability of returning to the starting node in each step.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Boolean array marking visited nodes, arrays of first and second endpoints
+        of distinct traversed edges (undirected, first endpoint smaller) and number of steps made
+        by each walker.
+    """
+
+    # Check stopping criteria.
+    if frac_cover is None and max_steps is None:
+        raise(ValueError("at least one of frac_cover and max_steps must be specified"))
+    num_nodes = len(indptr) - 1
+    target = num_nodes if frac_cover is None else frac_cover*num_nodes
+    max_steps = np.inf if max_steps is None else max_steps
+    rng = np.random.default_rng(seed)
+
+    # Initialize walkers and visited nodes.
+    starts = np.atleast_1d(np.asarray(starts, dtype=np.int64))
+    degrees = np.diff(indptr)
+    pos = starts.copy()
+    visited = np.zeros(num_nodes, dtype=bool)
+    visited[starts] = True
+    num_visited = np.count_nonzero(visited)
+    claim = np.zeros(num_nodes, dtype=np.int64)
+    edge_keys, num_buffered, num_unique = [], 0, 0
+
+    # Move all walkers in each step until stopping criterion met.
+    step = 0
+    while num_visited < target and step < max_steps:
+        deg = degrees[pos]
+        moved = (deg > 0) & (rng.random(len(pos)) >= restart_prob) if restart_prob > 0 else deg > 0
+        deg_moved = deg[moved]
+        offsets = np.minimum((rng.random(len(deg_moved))*deg_moved).astype(np.int64), deg_moved-1)
+        nxt = starts.copy()
+        nxt[moved] = indices[indptr[pos[moved]] + offsets]
+
+        # Record traversed edges and newly visited nodes (a node visited by several
+        # walkers in the same step is counted once).
+        edge_keys.append(np.minimum(pos[moved], nxt[moved])*num_nodes + np.maximum(pos[moved], nxt[moved]))
+        num_buffered += len(edge_keys[-1])
+        if num_buffered > EDGE_BUFFER_SIZE + 2*num_unique:
+            edge_keys = [_unique_edges(edge_keys)]
+            num_unique = num_buffered = len(edge_keys[0])
+        new = nxt[~visited[nxt]]
+        if len(new) > 0:
+            visited[new] = True
+            claim[new] = np.arange(len(new))
+            num_visited += np.count_nonzero(claim[new] == np.arange(len(new)))
+        pos = nxt
+        step += 1
+
+    keys = _unique_edges(edge_keys)
+    return visited, keys//num_nodes, keys % num_nodes, step
+
+
+def induced_edges(indptr, indices, mask):
+    """
+    Get edges of subgraph induced by specified nodes.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        mask (numpy.ndarray): Boolean array marking nodes of the subgraph.
+
+    Returns:
+        (tuple): Arrays of first and second endpoints of edges (each undirected edge once, first endpoint smaller).
+    """
+    src = np.repeat(np.arange(len(indptr)-1), np.diff(indptr))
+    keep = mask[src] & mask[indices] & (src < indices)
+    return src[keep], indices[keep]
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    import csr
+    rng = np.random.default_rng(0)
+    num_nodes = 10**6
+    src, dst = rng.integers(num_nodes, size=5*10**6), rng.integers(num_nodes, size=5*10**6)
+    indptr, indices = csr.edges_to_csr(np.concatenate((src, dst)), np.concatenate((dst, src)), num_nodes)
+    start = time.time()
+    visited, _, _, steps = random_walks(indptr, indices, rng.integers(num_nodes, size=10000), max_steps=2000, seed=0)
+    print("Made {0} steps in {1:.2f}s".format(10000*steps, time.time() - start))
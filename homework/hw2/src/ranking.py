@@ -0,0 +1,333 @@
+import numpy as np
+import sampling
+
+
+def top_k_nodes(importances, k):
+    """
+    Get k most important nodes without sorting all nodes. Ties are broken by order
+    of nodes in dictionary (same as a stable sort by decreasing score).
+    Author: Jernej Vivod
+
+    Args:
+        importances (dict): Dictionary mapping node indices to their estimated importances.
+        k (int): Number of nodes to return.
+
+    Returns:
+        (list): List of tuples of node indices and their scores sorted by decreasing score.
+    """
+
+    # Get nodes and scores as arrays.
+    nodes = list(importances.keys())
+    scores = np.fromiter(importances.values(), dtype=float, count=len(nodes))
+    k = min(k, len(nodes))
+    if k <= 0:
+        return []
+
+    # Find k-th largest score and select nodes with higher scores and first nodes with equal score.
+    threshold = -np.partition(-scores, k-1)[k-1]
+    greater = np.flatnonzero(scores > threshold)
+    equal = np.flatnonzero(scores == threshold)[:k-len(greater)]
+    top = np.concatenate((greater, equal))
+
+    # Sort selected nodes by decreasing score and position.
+    top = top[np.lexsort((top, -scores[top]))]
+    return [(nodes[idx], float(scores[idx])) for idx in top]
+
+
+class NodeRanking:
+    """
+    Ranking of nodes according to their importance scores. The ordering of the nodes,
+    their ranks and percentiles are computed once so that queries for any number of
+    nodes are answered without sorting.
+    Author: Jernej Vivod
+
+    Args:
+        importances (dict): Dictionary mapping node indices to their estimated importances.
+    """
+
+    def __init__(self, importances):
+
+        # Store nodes and scores as arrays.
+        self.importances = importances
+        self.nodes = list(importances.keys())
+        self.scores = np.fromiter(importances.values(), dtype=float, count=len(self.nodes))
+        self.node_to_idx = {node: idx for idx, node in enumerate(self.nodes)}
+
+        # Sort nodes by decreasing score. Ties are broken by order of nodes in dictionary.
+        self.order = np.argsort(-self.scores, kind='stable')
+
+        # Compute rank of each node (position in ordering) and rank shared
+        # by tied nodes (number of nodes with strictly higher score).
+        self.ranks = np.empty(len(self.nodes), dtype=np.int64)
+        self.ranks[self.order] = np.arange(len(self.nodes))
+        scores_asc = self.scores[self.order[::-1]]
+        num_lower_eq = np.searchsorted(scores_asc, self.scores, side='right')
+        num_lower = np.searchsorted(scores_asc, self.scores, side='left')
+        self.ranks_min = len(self.nodes) - num_lower_eq
+
+        # Compute percentiles of scores (same as scipy.stats.percentileofscore with kind='rank').
+        self.percentiles = (num_lower + num_lower_eq + (num_lower_eq > num_lower))*50.0/len(self.nodes)
+
+
+    def _idxs(self, nodes):
+        """
+        Get positions of specified nodes in the score array.
+        Author: Jernej Vivod
+
+        Args:
+            nodes (list): List of node indices.
+
+        Returns:
+            (numpy.ndarray): Positions of nodes in the score array.
+        """
+        return np.fromiter((self.node_to_idx[node] for node in nodes), dtype=np.int64, count=len(nodes))
+
+
+    def rank(self, nodes, ties='first'):
+        """
+        Get ranks of specified nodes (0 for the most important node).
+        Author: Jernej Vivod
+
+        Args:
+            nodes (list): List of node indices.
+            ties (str): If 'first', tied nodes are ranked in order of the importances dictionary.
+            If 'min', tied nodes share the lowest rank.
+
+        Returns:
+            (numpy.ndarray): Ranks of specified nodes.
+        """
+
+        # Check if specified tie handling valid.
+        if ties not in {'first', 'min'}:
+            raise(ValueError("the ties parameter can take the values of 'first' or 'min'"))
+
+        return (self.ranks if ties == 'first' else self.ranks_min)[self._idxs(nodes)]
+
+
+    def percentile(self, nodes):
+        """
+        Get percentiles of the scores of specified nodes.
+        Author: Jernej Vivod
+
+        Args:
+            nodes (list): List of node indices.
+
+        Returns:
+            (numpy.ndarray): Percentiles of the scores of specified nodes.
+        """
+        return self.percentiles[self._idxs(nodes)]
+
+
+    def top_k(self, k):
+        """
+        Get k most important nodes and their scores.
+        Author: Jernej Vivod
+
+        Args:
+            k (int): Number of nodes to return.
+
+        Returns:
+            (list): List of tuples of node indices and their scores sorted by decreasing score.
+        """
+        return [(self.nodes[idx], self.scores[idx]) for idx in self.order[:k]]
+
+
+def _graph_hash(graph):
+    """
+    Compute order-independent hash of the sets of nodes and edges of graph. The hashes of
+    nodes and edges are mixed and summed so that the result does not depend on the order
+    in which they are stored. For undirected graphs, the endpoints of edges are ordered first.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+
+    Returns:
+        (int): Hash of the graph.
+    """
+
+    # Get hashes of nodes and endpoints of edges.
+    node_hashes = np.fromiter((hash(node) for node in graph.nodes()), dtype=np.int64, count=graph.number_of_nodes()).view(np.uint64)
+    edge_hashes = np.fromiter((hash(node) for edge in graph.edges() for node in edge[:2]), dtype=np.int64,
+            count=2*graph.number_of_edges()).view(np.uint64).reshape(-1, 2)
+    first, second = edge_hashes[:, 0], edge_hashes[:, 1]
+    if not graph.is_directed():
+        first, second = np.minimum(first, second), np.maximum(first, second)
+
+    # Mix and sum hashes.
+    with np.errstate(over='ignore'):
+        edge_keys = sampling._mix(sampling._mix(first) + second*np.uint64(0x9E3779B97F4A7C15))
+        return int(np.sum(sampling._mix(node_hashes), dtype=np.uint64) + np.sum(edge_keys, dtype=np.uint64)*np.uint64(3))
+
+
+def _freeze(value):
+    """
+    Convert value to a hashable equivalent. Dictionaries, sets, lists, tuples and numpy
+    arrays are converted recursively (arrays by their data type, shape and contents).
+    Author: Jernej Vivod
+
+    Args:
+        value (obj): Value to convert.
+
+    Returns:
+        (obj): Hashable equivalent of the value.
+    """
+    if isinstance(value, dict):
+        return ('dict', frozenset((key, _freeze(val)) for key, val in value.items()))
+    elif isinstance(value, (set, frozenset)):
+        return ('set', frozenset(_freeze(val) for val in value))
+    elif isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(val) for val in value))
+    elif isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, np.ascontiguousarray(value).tobytes())
+    return value
+
+
+def _cache_key(measure, kwargs):
+    """
+    Get key of ranking according to specified measure and keyword arguments in the cache.
+    Author: Jernej Vivod
+
+    Args:
+        measure (str): Argument specifying the node importance measure.
+        kwargs (dict): Keyword arguments for the importance function.
+
+    Returns:
+        (tuple): Hashable key or None if the keyword arguments cannot be made hashable.
+    """
+    key = (measure, tuple(sorted((name, _freeze(val)) for name, val in kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class RankingCache:
+    """
+    Cache of node rankings for a graph. Each importance measure is computed once
+    per version of the graph. The version is a counter increased by the invalidate
+    method, which is called automatically if the number of nodes changed (checked
+    in constant time on each query). Other changes of the structure of the graph
+    (e.g. adding, removing or rewiring edges) are detected by the check method,
+    which compares an order-independent hash of the sets of nodes and edges with the
+    one computed at its previous call. Changes of node or edge attributes (e.g. weights)
+    must be signalled by calling the invalidate method.
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+        importance_func (function): Function computing node importances for a graph,
+        measure and keyword arguments.
+    """
+
+    def __init__(self, graph, importance_func):
+        self.graph = graph
+        self.importance_func = importance_func
+        self.rankings = dict()
+        self.version = 0
+        self.num_nodes = graph.number_of_nodes()
+        self.graph_hash = None
+
+
+    def invalidate(self):
+        """
+        Remove all cached rankings and increase the version of the graph.
+        Author: Jernej Vivod
+        """
+        self.rankings.clear()
+        self.version += 1
+        self.num_nodes = self.graph.number_of_nodes()
+
+
+    def check(self):
+        """
+        Check if the sets of nodes and edges of the graph changed since the previous call (in a
+        pass over the edges) and remove the cached rankings if they did. The first call only
+        records the state of the graph.
+        Author: Jernej Vivod
+
+        Returns:
+            (bool): True if the graph changed and the rankings were removed, else False.
+        """
+        graph_hash = (self.graph.number_of_nodes(), self.graph.number_of_edges(), _graph_hash(self.graph))
+        changed = self.graph_hash is not None and graph_hash != self.graph_hash
+        if changed:
+            self.invalidate()
+        self.graph_hash = graph_hash
+        return changed
+
+
+    def get(self, measure, **kwargs):
+        """
+        Get ranking of nodes according to specified measure. Compute it if not cached.
+        Author: Jernej Vivod
+
+        Args:
+            measure (str): Argument specifying the node importance measure to use.
+            **kwargs (dict): Keyword arguments for the importance function.
+
+        Returns:
+            (obj): NodeRanking instance for the measure.
+        """
+
+        # If number of nodes changed, remove rankings computed on previous version.
+        if self.graph.number_of_nodes() != self.num_nodes:
+            self.invalidate()
+
+        # Compute ranking if not yet cached (without caching it if the arguments are not hashable).
+        key = _cache_key(measure, kwargs)
+        if key is None:
+            return NodeRanking(self.importance_func(self.graph, measure, **kwargs))
+        if key not in self.rankings:
+            self.rankings[key] = NodeRanking(self.importance_func(self.graph, measure, **kwargs))
+        return self.rankings[key]
+
+
+    def put(self, measure, importances, **kwargs):
+        """
+        Store ranking of nodes according to specified measure computed elsewhere
+        (e.g. together with other measures).
+        Author: Jernej Vivod
+
+        Args:
+            measure (str): Argument specifying the node importance measure.
+            importances (dict): Dictionary mapping node indices to their importances.
+            **kwargs (dict): Keyword arguments for the importance function the importances correspond to
+            (if they cannot be made hashable, the ranking is not stored).
+        """
+
+        # If number of nodes changed, remove rankings computed on previous version.
+        if self.graph.number_of_nodes() != self.num_nodes:
+            self.invalidate()
+        key = _cache_key(measure, kwargs)
+        if key is not None:
+            self.rankings[key] = NodeRanking(importances)
+
+
+### TEST ###
+if __name__ == '__main__':
+    import importlib
+    import networkx as nx
+
+    # Rank node through cache with personalization and starting values (dict and array arguments).
+    script = importlib.import_module('1')
+    graph = nx.karate_club_graph()
+    cache = RankingCache(graph, script.node_importances)
+    personalization = {0: 1.0, 33: 0.5}
+    nstart = {node: 1.0 for node in graph.nodes()}
+    rank_p = script.node_rank(graph, 0, 'PageRank', cache=cache, personalization=personalization)
+    rank_s = script.node_rank(graph, 0, 'PageRank', cache=cache, nstart=nstart)
+    assert rank_p == script.node_rank(graph, 0, 'PageRank', personalization=dict(personalization))
+    assert rank_s == script.node_rank(graph, 0, 'PageRank', nstart=nstart)
+    assert len(cache.rankings) == 2
+    script.node_rank(graph, 0, 'PageRank', cache=cache, personalization={33: 0.5, 0: 1.0})
+    assert len(cache.rankings) == 2
+    assert _cache_key('m', {'x': np.arange(3)}) == _cache_key('m', {'x': np.arange(3)}) != _cache_key('m', {'x': np.arange(4)})
+
+    # Detect rewiring that preserves numbers of nodes and edges.
+    assert not cache.check()
+    graph.remove_edge(0, 1)
+    graph.add_edge(9, 32)
+    assert len(cache.rankings) == 2 and cache.check() and len(cache.rankings) == 0 and cache.version == 1
+    print("ranks through cache: {0} (personalization), {1} (nstart)".format(rank_p, rank_s))
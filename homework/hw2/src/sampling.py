@@ -0,0 +1,288 @@
+import numpy as np
+
+
+def read_edge_chunks(path, chunk_size=2**24):
+    """
+    Read edge list file in chunks. Lines starting with '#' are skipped and only the first
+    two columns (integer node IDs) of other lines are used.
+    Author: Jernej Vivod
+
+    Args:
+        path (str): Path to the edge list file.
+        chunk_size (int): Approximate number of bytes read in each chunk.
+
+    Returns:
+        (generator): Generator of tuples of arrays of first and second endpoints of edges.
+    """
+    with open(path, 'r') as f:
+        while True:
+            lines = f.readlines(chunk_size)
+            if not lines:
+                break
+            pairs = [line.split()[:2] for line in lines if line.strip() and not line.startswith('#')]
+            edges = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+            yield edges[:, 0], edges[:, 1]
+
+
+def _mix(x):
+    """
+    Mix bits of 64-bit unsigned integers using the splitmix64 finalizer.
+    Author: Jernej Vivod
+
+    Args:
+        x (numpy.ndarray): Array of 64-bit unsigned integers.
+
+    Returns:
+        (numpy.ndarray): Array of mixed integers.
+    """
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _node_hash(nodes, seed):
+    """
+    Map node IDs to pseudorandom numbers in interval [0, 1) using the splitmix64 hash function.
+    The same node is always mapped to the same number for the same seed.
+    Author: Jernej Vivod
+
+    Args:
+        nodes (numpy.ndarray): Array of node IDs.
+        seed (int): Seed of the hash function.
+
+    Returns:
+        (numpy.ndarray): Array of pseudorandom numbers.
+    """
+    with np.errstate(over='ignore'):
+        x = _mix(nodes.astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15))
+    return (x >> np.uint64(11)).astype(np.float64) / float(2**53)
+
+
+def _induced(edges, nodes):
+    """
+    Get edges of subgraph induced by specified nodes in a pass over the edge stream.
+    Author: Jernej Vivod
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges.
+        nodes (numpy.ndarray): Sorted array of node IDs.
+
+    Returns:
+        (tuple): Arrays of first and second endpoints of edges.
+    """
+    res_src, res_dst = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for src, dst in edges():
+        keep = np.isin(src, nodes) & np.isin(dst, nodes)
+        res_src.append(src[keep])
+        res_dst.append(dst[keep])
+    return np.concatenate(res_src), np.concatenate(res_dst)
+
+
+def _neighbors(edges, nodes):
+    """
+    Get pairs of specified nodes and their neighbors in a pass over the edge stream
+    (edges are treated as undirected).
+    Author: Jernej Vivod
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges.
+        nodes (numpy.ndarray): Sorted array of node IDs.
+
+    Returns:
+        (tuple): Arrays of nodes and their neighbors (each distinct pair once).
+    """
+    res_node, res_neigh = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for src, dst in edges():
+        from_src, from_dst = np.isin(src, nodes), np.isin(dst, nodes)
+        res_node.extend((src[from_src], dst[from_dst]))
+        res_neigh.extend((dst[from_src], src[from_dst]))
+    node, neigh = np.concatenate(res_node), np.concatenate(res_neigh)
+    pairs = np.unique(np.column_stack((node, neigh)), axis=0)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _random_per_group(rng, groups, limits):
+    """
+    Randomly select at most the specified number of elements in each group.
+    Author: Jernej Vivod
+
+    Args:
+        rng (numpy.random.Generator): Random number generator.
+        groups (numpy.ndarray): Group of each element.
+        limits (numpy.ndarray): Maximum number of selected elements for each element's group.
+
+    Returns:
+        (numpy.ndarray): Boolean array marking selected elements.
+    """
+
+    # Shuffle elements within groups and compute position of each element in its group.
+    order = np.lexsort((rng.random(len(groups)), groups))
+    groups_sorted = groups[order]
+    group_start = np.concatenate(([True], groups_sorted[1:] != groups_sorted[:-1]))
+    starts = np.flatnonzero(group_start)
+    positions = np.arange(len(groups)) - np.repeat(starts, np.diff(np.append(starts, len(groups))))
+
+    # Select elements at positions below the limit.
+    selected = np.zeros(len(groups), dtype=bool)
+    selected[order] = positions < limits[order]
+    return selected
+
+
+def random_node_sample(edges, frac, seed=0):
+    """
+    Sample nodes independently with specified probability and return the subgraph induced by them.
+    A node is selected if its hashed ID is below the probability so a single pass over the edge
+    stream suffices. Nodes without edges to other selected nodes do not appear in the result.
+    Author: Jernej Vivod
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges (e.g. read_edge_chunks).
+        frac (float): Probability of selecting each node.
+        seed (int): Seed of the hash function.
+
+    Returns:
+        (tuple): Arrays of first and second endpoints of edges of sampled subgraph.
+    """
+    res_src, res_dst = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for src, dst in edges():
+        keep = (_node_hash(src, seed) < frac) & (_node_hash(dst, seed) < frac)
+        res_src.append(src[keep])
+        res_dst.append(dst[keep])
+    return np.concatenate(res_src), np.concatenate(res_dst)
+
+
+def induced_edge_sample(edges, frac, seed=None):
+    """
+    Sample edges independently with specified probability and return the subgraph induced by
+    their endpoints. The first pass over the edge stream samples the edges and the second pass
+    adds all edges between the sampled nodes.
+    Author: Jernej Vivod
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges (e.g. read_edge_chunks).
+        frac (float): Probability of selecting each edge.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Arrays of first and second endpoints of edges of sampled subgraph.
+    """
+
+    # Sample edges and get their endpoints.
+    rng = np.random.default_rng(seed)
+    nodes = [np.zeros(0, dtype=np.int64)]
+    for src, dst in edges():
+        keep = rng.random(len(src)) < frac
+        nodes.append(np.unique(np.concatenate((src[keep], dst[keep]))))
+
+    # Get subgraph induced by endpoints.
+    return _induced(edges, np.unique(np.concatenate(nodes)))
+
+
+def snowball_sample(edges, seeds, num_levels, max_neighbors=None, seed=None):
+    """
+    Sample nodes by snowball sampling and return the subgraph induced by them. Starting with the
+    seed nodes, at most max_neighbors randomly selected neighbors of each node in the current level
+    are added to the sample and the nodes not sampled before form the next level. Each level
+    requires a pass over the edge stream.
+    Author: Jernej Vivod
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges (e.g. read_edge_chunks).
+        seeds (numpy.ndarray): Seed node IDs.
+        num_levels (int): Number of levels to expand.
+        max_neighbors (int): Maximum number of neighbors selected for each node. If None, all neighbors are selected.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Sorted array of sampled node IDs and arrays of first and second endpoints of
+        edges of sampled subgraph.
+    """
+    rng = np.random.default_rng(seed)
+    sampled = np.unique(np.asarray(seeds, dtype=np.int64))
+    frontier = sampled
+    for _ in range(num_levels):
+        if len(frontier) == 0:
+            break
+
+        # Select neighbors of nodes in current level.
+        node, neigh = _neighbors(edges, frontier)
+        if max_neighbors is not None:
+            neigh = neigh[_random_per_group(rng, node, np.full(len(node), max_neighbors))]
+
+        # Add neighbors not sampled before to sample and next level.
+        frontier = np.setdiff1d(neigh, sampled)
+        sampled = np.union1d(sampled, frontier)
+
+    return (sampled,) + _induced(edges, sampled)
+
+
+def forest_fire_sample(edges, num_sampled, p_forward=0.7, seed=None):
+    """
+    Sample nodes by forest fire sampling and return the subgraph induced by them. Each burning node
+    ignites a geometrically distributed number (with mean p_forward/(1-p_forward)) of its unburned
+    neighbors which burn in the next level. If the fire dies out, it is restarted at the unburned node
+    with the lowest hashed ID. Each level requires a pass over the edge stream.
+    Author: Jernej Vivod
+
+    Args:
+        edges (function): Function returning a new iterator over chunks of edges (e.g. read_edge_chunks).
+        num_sampled (int): Number of nodes to sample.
+        p_forward (float): Forward burning probability.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Sorted array of sampled node IDs and arrays of first and second endpoints of
+        edges of sampled subgraph.
+    """
+    rng = np.random.default_rng(seed)
+    hash_seed = int(rng.integers(2**32))
+    sampled = np.zeros(0, dtype=np.int64)
+    frontier = np.zeros(0, dtype=np.int64)
+    while len(sampled) < num_sampled:
+
+        # If fire died out, restart it at the unburned node with the lowest hashed ID.
+        if len(frontier) == 0:
+            best_node, best_hash = None, np.inf
+            for src, dst in edges():
+                candidates = np.setdiff1d(np.concatenate((src, dst)), sampled)
+                if len(candidates) > 0:
+                    hashes = _node_hash(candidates, hash_seed)
+                    idx = np.argmin(hashes)
+                    if hashes[idx] < best_hash:
+                        best_node, best_hash = candidates[idx], hashes[idx]
+            if best_node is None:
+                break
+            frontier = np.array([best_node])
+            sampled = np.union1d(sampled, frontier)
+            continue
+
+        # Get unburned neighbors of burning nodes and ignite a random number of them.
+        node, neigh = _neighbors(edges, frontier)
+        unburned = ~np.isin(neigh, sampled)
+        node, neigh = node[unburned], neigh[unburned]
+        num_burning = rng.geometric(1.0 - p_forward, size=len(frontier)) - 1
+        limits = num_burning[np.searchsorted(frontier, node)]
+        ignited = np.unique(neigh[_random_per_group(rng, node, limits)])
+
+        # Add ignited nodes to sample (in random order until the required number is reached).
+        ignited = rng.permutation(ignited)[:num_sampled - len(sampled)]
+        sampled = np.union1d(sampled, ignited)
+        frontier = np.sort(ignited)
+
+    return (sampled,) + _induced(edges, sampled)
+
+
+### TEST ###
+if __name__ == '__main__':
+    PATH = "../data/social"
+    edges = lambda: read_edge_chunks(PATH)
+    src, dst = random_node_sample(edges, 0.2)
+    print("Random node sample: {0} edges".format(len(src)))
+    src, dst = induced_edge_sample(edges, 0.1, seed=0)
+    print("Induced edge sample: {0} edges".format(len(src)))
+    nodes, src, dst = snowball_sample(edges, [1], 3, max_neighbors=5, seed=0)
+    print("Snowball sample: {0} nodes, {1} edges".format(len(nodes), len(src)))
+    nodes, src, dst = forest_fire_sample(edges, 1000, seed=0)
+    print("Forest fire sample: {0} nodes, {1} edges".format(len(nodes), len(src)))
@@ -0,0 +1,199 @@
+import os
+import multiprocessing
+import statistics
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.csgraph as csgraph
+import csr
+import betweenness
+
+
+# CSR arrays of the graph being processed (set in each worker process).
+_indptr = None
+_indices = None
+
+
+def _init_worker(indptr, indices):
+    """
+    Store CSR arrays of the graph in the worker process so that they are
+    not sent along with each task.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+    """
+
+    global _indptr, _indices
+    _indptr = indptr
+    _indices = indices
+
+
+def bfs_distances(indptr, indices, source):
+    """
+    Compute distances from source node to all nodes using level-synchronous BFS.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        source (int): Index of the source node.
+
+    Returns:
+        (numpy.ndarray): Array of distances (-1 for unreachable nodes).
+    """
+    num_nodes = len(indptr) - 1
+    dist = np.full(num_nodes, -1, dtype=np.int64)
+    owner = np.zeros(num_nodes, dtype=np.int64)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    depth = 0
+    while frontier.size > 0:
+        _, children = betweenness._expand_frontier(indptr, indices, frontier)
+
+        # Keep newly discovered nodes (each once) as next frontier.
+        children = children[dist[children] == -1]
+        owner[children] = np.arange(len(children))
+        frontier = children[owner[children] == np.arange(len(children))]
+        depth += 1
+        dist[frontier] = depth
+
+    return dist
+
+
+def _source_statistics(sources):
+    """
+    Compute number of reachable nodes, sum of distances and sum of inverse distances to
+    other nodes for each source node (executed in worker process).
+    Author: Jernej Vivod
+
+    Args:
+        sources (numpy.ndarray): Indices of source nodes.
+
+    Returns:
+        (numpy.ndarray): Matrix with one row (count, sum of distances, sum of inverse distances) per source.
+    """
+    res = np.empty((len(sources), 3), dtype=float)
+    for idx, source in enumerate(sources):
+        dist = bfs_distances(_indptr, _indices, source)
+        dist = dist[dist > 0]
+        res[idx] = len(dist), dist.sum(), np.sum(1.0/dist)
+    return res
+
+
+def average_shortest_path_length(indptr, indices, mode='lcc', rel_tol=0.01, confidence=0.95, min_sources=30,
+        max_sources=None, batch_size=None, seed=None, num_workers=None):
+    """
+    Estimate average shortest path length of undirected graph from BFS runs started at randomly
+    sampled source nodes. In the 'lcc' mode, the average is taken over pairs of nodes in the largest
+    connected component. In the 'harmonic' mode, the average inverse distance (efficiency) is estimated
+    over all pairs of nodes (unreachable pairs contribute 0) and the estimate is its inverse. Sources
+    are sampled without replacement in batches processed in parallel and the sampling stops once
+    the half-width of the confidence interval relative to the estimate is at most rel_tol (if all
+    candidate sources are used, the result is exact).
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+        mode (str): Either 'lcc' or 'harmonic'.
+        rel_tol (float): Target relative half-width of the confidence interval.
+        confidence (float): Confidence level of the interval.
+        min_sources (int): Minimum number of sources before the stopping rule is checked.
+        max_sources (int): Maximum number of sources. If None, all candidate sources may be used.
+        batch_size (int): Number of sources in each batch. If None, use 4 sources per worker (at least min_sources).
+        seed (int): Seed for the random number generator.
+        num_workers (int): Number of worker processes to use. If None, use number of CPUs.
+
+    Returns:
+        (tuple): Estimate of the average shortest path length, tuple of lower and upper bound
+        of the confidence interval and number of sources used.
+    """
+
+    # Check if specified mode valid.
+    if mode not in {'lcc', 'harmonic'}:
+        raise(ValueError("the mode parameter can take the values of 'lcc' or 'harmonic'"))
+
+    # Get candidate sources (nodes of largest connected component in the 'lcc' mode).
+    num_nodes = len(indptr) - 1
+    if mode == 'lcc':
+        adj = sp.csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(num_nodes, num_nodes))
+        _, labels = csgraph.connected_components(adj, directed=False)
+        candidates = np.flatnonzero(labels == np.argmax(np.bincount(labels)))
+    else:
+        candidates = np.arange(num_nodes)
+    num_candidates = len(candidates)
+    if num_candidates < 2:
+        raise(ValueError("at least two nodes required"))
+
+    # Sample order of sources.
+    rng = np.random.default_rng(seed)
+    sources = rng.permutation(candidates)[:num_candidates if max_sources is None else max_sources]
+    num_workers = os.cpu_count() if num_workers is None else num_workers
+    batch_size = max(4*num_workers, min_sources) if batch_size is None else batch_size
+    z = statistics.NormalDist().inv_cdf((1.0 + confidence)/2.0)
+
+    # Process batches of sources until the confidence interval is tight enough.
+    pool = multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(indptr, indices)) if num_workers > 1 else None
+    if pool is None:
+        _init_worker(indptr, indices)
+    try:
+        values = np.zeros(0)
+        for start in range(0, len(sources), batch_size):
+            batch = sources[start:start+batch_size]
+            if pool is None:
+                stats = _source_statistics(batch)
+            else:
+                stats = np.vstack(pool.map(_source_statistics, np.array_split(batch, min(num_workers, len(batch)))))
+
+            # Get per-source mean distance (or mean inverse distance) to other candidates.
+            per_source = stats[:, 1] if mode == 'lcc' else stats[:, 2]
+            values = np.concatenate((values, per_source/(num_candidates - 1)))
+
+            # Compute confidence interval (with finite population correction).
+            mean = values.mean()
+            if len(values) == num_candidates:
+                half_width = 0.0
+            elif len(values) > 1:
+                half_width = z*values.std(ddof=1)/np.sqrt(len(values))*np.sqrt((num_candidates - len(values))/(num_candidates - 1))
+            else:
+                half_width = np.inf
+            if len(values) >= min_sources and half_width <= rel_tol*mean:
+                break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # Return estimate and interval (inverted in the 'harmonic' mode).
+    if mode == 'lcc':
+        return mean, (mean - half_width, mean + half_width), len(values)
+    low, high = mean - half_width, mean + half_width
+    return 1.0/mean, (1.0/high, 1.0/low if low > 0 else np.inf), len(values)
+
+
+def graph_average_shortest_path_length(graph, **kwargs):
+    """
+    Estimate average shortest path length of undirected graph (see average_shortest_path_length).
+    Author: Jernej Vivod
+
+    Args:
+        graph (obj): Networkx representation of the graph.
+        **kwargs (dict): Parameters passed to average_shortest_path_length.
+
+    Returns:
+        (tuple): Estimate of the average shortest path length, tuple of lower and upper bound
+        of the confidence interval and number of sources used.
+    """
+    indptr, indices, _ = csr.graph_to_csr(graph)
+    return average_shortest_path_length(indptr, indices, **kwargs)
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    import random_graphs
+    indptr, indices = random_graphs.gnm(10**5, 5*10**5, seed=0)
+    start = time.time()
+    estimate, (low, high), num_sources = average_shortest_path_length(indptr, indices, seed=0)
+    print("Average distance {0:.4f} [{1:.4f}, {2:.4f}] from {3} sources in {4:.2f}s".format(estimate, low, high, num_sources, time.time() - start))
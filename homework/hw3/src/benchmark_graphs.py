@@ -1,51 +1,146 @@
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.csgraph as csgraph
 import parse_network
+import random_graphs
 import random
 import matplotlib.pyplot as plt
 
 
-def girvan_newman(num_groups, group_sizes, expected_degree, mu):
+def _symmetric_adjacency(rows, cols, num_nodes):
     """
-    Construct Girvan-Newman benchmark graph with specified properties.
+    Construct symmetric adjacency matrix in CSR format from undirected edges.
+
+    Args:
+        rows (numpy.ndarray): First endpoints of edges
+        cols (numpy.ndarray): Second endpoints of edges
+        num_nodes (int): Number of nodes
+
+    Returns:
+        (scipy.sparse.csr_matrix): Adjacency matrix
+    """
+    data = np.ones(2*len(rows), dtype=np.int8)
+    return sp.csr_matrix((data, (np.concatenate((rows, cols)), np.concatenate((cols, rows)))), shape=(num_nodes, num_nodes))
+
+
+def planted_partition(num_groups, group_sizes, p_same, p_other, seed=None):
+    """
+    Construct planted-partition graph with specified number of equally sized groups. The number
+    of edges within and between groups is drawn from a binomial distribution and the edges are
+    then selected uniformly among the candidate node pairs, so the time is proportional to the
+    number of edges.
+
+    Args:
+        num_groups (int): Number of groups
+        group_sizes (int): Sizes of groups
+        p_same (float): Probability of a link between nodes in same group
+        p_other (float): Probability of a link between nodes in different groups
+        seed (int): Seed for the random number generator
+
+    Returns:
+        (tuple): Adjacency matrix in CSR format and array of group labels of nodes
+    """
+
+    rng = np.random.default_rng(seed)
+    num_nodes = num_groups*group_sizes
+    labels = np.arange(num_nodes)//group_sizes
+
+    # Select node pairs within groups. Pairs are enumerated group by group.
+    pairs_group = group_sizes*(group_sizes-1)//2
+    num_pairs_same = num_groups*pairs_group
+    idxs = rng.choice(num_pairs_same, size=rng.binomial(num_pairs_same, min(p_same, 1.0)), replace=False)
+    group, idxs_in = np.divmod(idxs, pairs_group) if pairs_group > 0 else (idxs, idxs)
+    first, second = random_graphs.decode_pairs(idxs_in)
+    rows_same, cols_same = group*group_sizes + first, group*group_sizes + second
+
+    # Select node pairs between groups. Pairs are enumerated by pair of groups.
+    pairs_groups = group_sizes*group_sizes
+    num_pairs_other = num_groups*(num_groups-1)//2*pairs_groups
+    idxs = rng.choice(num_pairs_other, size=rng.binomial(num_pairs_other, min(p_other, 1.0)), replace=False)
+    group_pair, idxs_in = np.divmod(idxs, pairs_groups) if pairs_groups > 0 else (idxs, idxs)
+    group1, group2 = random_graphs.decode_pairs(group_pair)
+    rows_other, cols_other = group1*group_sizes + idxs_in//group_sizes, group2*group_sizes + idxs_in % group_sizes
+
+    # Construct adjacency matrix.
+    adj = _symmetric_adjacency(np.concatenate((rows_same, rows_other)), np.concatenate((cols_same, cols_other)), num_nodes)
+    return adj, labels
+
+
+def to_networkx(adj, labels=None):
+    """
+    Construct networkx graph from adjacency matrix.
+
+    Args:
+        adj (scipy.sparse.csr_matrix): Symmetric adjacency matrix
+        labels (numpy.ndarray): Group labels of nodes to set as the 'label' attribute
+
+    Returns:
+        (object): Networkx representation of the graph
+    """
+    graph = nx.empty_graph(n=adj.shape[0], create_using=nx.Graph)
+    upper = sp.triu(adj, k=1).tocoo()
+    graph.add_edges_from(zip(upper.row.tolist(), upper.col.tolist()))
+    if labels is not None:
+        nx.set_node_attributes(graph, dict(enumerate(labels.tolist())), 'label')
+    return graph
+
+
+def labels_to_ground_truth(labels):
+    """
+    Convert array of community labels of nodes to ground truth in required format.
+
+    Args:
+        labels (numpy.ndarray): Community labels of nodes (consecutive integers starting at 0)
+
+    Returns:
+        (list): List of sets of nodes in communities
+    """
+    order = np.argsort(labels, kind='stable')
+    splits = np.cumsum(np.bincount(labels))[:-1]
+    return [set(comm.tolist()) for comm in np.split(order, splits)]
+
+
+def girvan_newman_csr(num_groups, group_sizes, expected_degree, mu, seed=None):
+    """
+    Construct Girvan-Newman benchmark graph with specified properties in CSR format.
 
     Args:
         num_groups (int): Number of groups in the benchmark graph
         group_sizes (int): Sizes of groups in the benchmark graph
         expected_degree (int): expected node degree in the benchmark graph
         mu (int): The mu parameter controlling the connectedness of the groups
+        seed (int): Seed for the random number generator
 
     Returns:
-        (tuple): Constructed graph and ground truth in required format
+        (tuple): Adjacency matrix in CSR format and array of group labels of nodes
     """
 
     # Compute probabilitiy of a link between nodes in same group and
     # link between nodes in different groups.
     p_same = expected_degree*(1-mu)/(group_sizes-1)
     p_other = expected_degree*mu/((num_groups-1)*group_sizes)
-    
-    # Initialize empty graph with specified number of nodes. 
-    graph = nx.empty_graph(n=num_groups*group_sizes, create_using=nx.Graph)
-    
-    # Label groups of nodes and construct ground truth in required format.
-    nx.set_node_attributes(graph, {idx : {'label' : idx//group_sizes} for idx in range(graph.number_of_nodes())})
-    attrs = nx.get_node_attributes(graph, 'label')
-    ground_truth = [{node_idx for node_idx, label in attrs.items() if label == comm_label} for comm_label in set(attrs.values())]
 
-    # Add links.
-    node_idxs = list(graph.nodes())
-    for idx1 in range(len(node_idxs)-1):
-        for idx2 in range(idx1+1, len(node_idxs)):
-            if graph.nodes()[idx1]['label'] == graph.nodes()[idx2]['label']:
-                # If nodes in same group, add link with probabilitiy p_same.
-                if random.random() < p_same:
-                    graph.add_edge(idx1, idx2)
-            else:
-                # If nodes not in same group, add link with probability p_other.
-                if random.random() < p_other:
-                    graph.add_edge(idx1, idx2)
-    
-    # Return constructed graph and ground truth.
-    return graph, ground_truth
+    # Construct planted-partition graph with labeled groups.
+    return planted_partition(num_groups, group_sizes, p_same, p_other, seed=seed)
+
+
+def girvan_newman(num_groups, group_sizes, expected_degree, mu, seed=None):
+    """
+    Construct Girvan-Newman benchmark graph with specified properties.
+
+    Args:
+        num_groups (int): Number of groups in the benchmark graph
+        group_sizes (int): Sizes of groups in the benchmark graph
+        expected_degree (int): expected node degree in the benchmark graph
+        mu (int): The mu parameter controlling the connectedness of the groups
+        seed (int): Seed for the random number generator
+
+    Returns:
+        (tuple): Constructed graph and ground truth in required format
+    """
+    adj, labels = girvan_newman_csr(num_groups, group_sizes, expected_degree, mu, seed=seed)
+    return to_networkx(adj, labels), labels_to_ground_truth(labels)
 
 
 def draw_girvan_newman(num_groups, group_sizes, expected_degree, mu):
@@ -112,20 +207,324 @@ def lancichinetti(mu):
     return graph, ground_truth
 
 
-def erdos_renyi(num_nodes, average_degree):
+def _power_law_integral(a, b, p):
+    """
+    Compute integral of x^p over interval [a, b].
+
+    Args:
+        a (float): Lower bound of interval
+        b (float): Upper bound of interval
+        p (float): Exponent
+
+    Returns:
+        (float): Value of the integral
+    """
+    return np.log(b/a) if p == -1 else (b**(p+1) - a**(p+1))/(p+1)
+
+
+def _power_law_sample(rng, size, tau, a, b):
+    """
+    Sample values from power-law distribution with density proportional to x^(-tau) on [a, b]
+    using the inverse of the cumulative distribution function. Values are rounded to integers.
+
+    Args:
+        rng (numpy.random.Generator): Random number generator
+        size (int): Number of values to sample
+        tau (float): Exponent of the power-law distribution
+        a (float): Lower bound of values
+        b (float): Upper bound of values
+
+    Returns:
+        (numpy.ndarray): Sampled values
+    """
+    u = rng.random(size)
+    if tau == 1:
+        res = a*(b/a)**u
+    else:
+        res = (a**(1-tau) + u*(b**(1-tau) - a**(1-tau)))**(1/(1-tau))
+    return np.rint(res).astype(np.int64)
+
+
+def _power_law_min(tau, mean, b):
+    """
+    Find lower bound of power-law distribution on [a, b] with exponent tau that has specified mean.
+
+    Args:
+        tau (float): Exponent of the power-law distribution
+        mean (float): Required mean of the distribution
+        b (float): Upper bound of values
+
+    Returns:
+        (float): Lower bound of values
+    """
+
+    # Find lower bound using bisection (the mean increases with the lower bound).
+    low, high = 1.0, float(b)
+    for _ in range(100):
+        mid = (low + high)/2
+        if _power_law_integral(mid, b, 1-tau)/_power_law_integral(mid, b, -tau) < mean:
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def _community_sizes(rng, num_nodes, tau, min_size, max_size, max_attempts=100):
+    """
+    Sample sizes of communities from power-law distribution so that they sum to the number of nodes
+    and each size is between the minimum and maximum community size.
+
+    Args:
+        rng (numpy.random.Generator): Random number generator
+        num_nodes (int): Number of nodes
+        tau (float): Exponent of the power-law distribution
+        min_size (int): Minimum community size
+        max_size (int): Maximum community size
+        max_attempts (int): Maximum number of times the sizes are resampled
+
+    Returns:
+        (numpy.ndarray): Sizes of communities
+    """
+
+    # Check if the nodes can be partitioned into communities of allowed sizes.
+    if not 1 <= min_size <= max_size or (num_nodes + max_size - 1)//max_size > num_nodes//min_size:
+        raise(ValueError("the nodes cannot be partitioned into communities with sizes between min_community and max_community"))
+
+    mean = _power_law_integral(min_size, max_size, 1-tau)/_power_law_integral(min_size, max_size, -tau)
+    for _ in range(max_attempts):
+
+        # Sample sizes until their sum exceeds the number of nodes.
+        sizes = np.zeros(0, dtype=np.int64)
+        while sizes.sum() < num_nodes:
+            sizes = np.concatenate((sizes, _power_law_sample(rng, int(2*num_nodes/mean) + 1, tau, min_size, max_size)))
+        sizes = sizes[:np.searchsorted(np.cumsum(sizes), num_nodes) + 1]
+
+        # Trim last community. If it becomes too small, distribute its nodes among free places
+        # in other communities (resample if there are not enough free places).
+        sizes[-1] -= sizes.sum() - num_nodes
+        if sizes[-1] < min_size:
+            remaining = sizes[-1]
+            sizes = sizes[:-1]
+            free = max_size - sizes
+            if free.sum() < remaining:
+                continue
+            places = rng.choice(free.sum(), size=remaining, replace=False)
+            sizes += np.bincount(np.searchsorted(np.cumsum(free), places, side='right'), minlength=len(sizes))
+
+        assert sizes.sum() == num_nodes and sizes.min() >= min_size and sizes.max() <= max_size
+        return sizes
+
+    raise(ValueError("failed to sample community sizes between min_community and max_community"))
+
+
+def _assign_communities(rng, sizes, degrees_in, max_rounds=100):
+    """
+    Assign nodes to communities at random so that the internal degree of each node is smaller
+    than the size of its community. Nodes violating this are swapped with randomly selected nodes.
+    Internal degrees of nodes that remain in too small communities are truncated.
+
+    Args:
+        rng (numpy.random.Generator): Random number generator
+        sizes (numpy.ndarray): Sizes of communities
+        degrees_in (numpy.ndarray): Internal degrees of nodes (truncated in place)
+        max_rounds (int): Maximum number of rounds of swapping
+
+    Returns:
+        (numpy.ndarray): Community labels of nodes
+    """
+
+    # Assign nodes to random seats in communities.
+    labels = rng.permutation(np.repeat(np.arange(len(sizes)), sizes))
+
+    # Swap nodes in too small communities with random partners where the swap is valid for both.
+    for _ in range(max_rounds):
+        bad = np.flatnonzero(degrees_in >= sizes[labels])
+        if len(bad) == 0:
+            break
+        partners = rng.integers(len(labels), size=len(bad))
+        valid = (degrees_in[bad] < sizes[labels[partners]]) & (degrees_in[partners] < sizes[labels[bad]])
+        _, first = np.unique(partners, return_index=True)
+        valid[np.setdiff1d(np.arange(len(bad)), first)] = False
+        valid &= ~np.isin(partners, bad)
+        bad, partners = bad[valid], partners[valid]
+        labels[bad], labels[partners] = labels[partners], labels[bad]
+
+    # Truncate internal degrees of remaining nodes.
+    np.minimum(degrees_in, sizes[labels] - 1, out=degrees_in)
+    return labels
+
+
+def _wire_stubs(rng, stubs, groups, num_nodes, labels=None, max_rounds=20):
+    """
+    Pair stubs uniformly at random within groups (configuration model). Pairs forming self-loops,
+    repeated edges or (if labels specified) edges within a community are rejected and their stubs
+    are paired again in the next round. Stubs remaining after the last round are discarded.
+
+    Args:
+        rng (numpy.random.Generator): Random number generator
+        stubs (numpy.ndarray): Nodes to which the stubs belong
+        groups (numpy.ndarray): Groups of stubs (the number of stubs in each group must be even).
+        If None, stubs are paired across all nodes
+        num_nodes (int): Number of nodes
+        labels (numpy.ndarray): Community labels of nodes for rejecting edges within communities
+        max_rounds (int): Maximum number of rounds of pairing
+
+    Returns:
+        (tuple): Arrays of first and second endpoints of edges
+    """
+
+    keys = np.zeros(0, dtype=np.int64)
+    for _ in range(max_rounds):
+        if len(stubs) == 0:
+            break
+
+        # Shuffle stubs within groups and pair consecutive stubs.
+        if groups is None:
+            order = rng.permutation(len(stubs))
+        else:
+            order = np.argsort(groups + rng.random(len(stubs)))
+            groups = groups[order]
+        stubs = stubs[order]
+        first, second = np.minimum(stubs[0::2], stubs[1::2]), np.maximum(stubs[0::2], stubs[1::2])
+        keys_new = first*num_nodes + second
+
+        # Sort proposed edges and reject self-loops, repeated edges and edges within communities.
+        order = np.argsort(keys_new)
+        keys_sorted = keys_new[order]
+        valid = first[order] != second[order]
+        valid[1:] &= keys_sorted[1:] != keys_sorted[:-1]
+        pos = np.searchsorted(keys, keys_sorted)
+        if len(keys) > 0:
+            valid &= keys[np.minimum(pos, len(keys)-1)] != keys_sorted
+        if labels is not None:
+            valid &= labels[first[order]] != labels[second[order]]
+        if not np.any(valid):
+            break
+
+        # Add accepted edges (keeping them sorted) and keep stubs of rejected pairs.
+        keys = np.insert(keys, pos[valid], keys_sorted[valid])
+        rejected = np.zeros(len(keys_new), dtype=bool)
+        rejected[order[~valid]] = True
+        rejected = np.repeat(rejected, 2)
+        stubs = stubs[rejected]
+        groups = groups[rejected] if groups is not None else None
+
+    return keys//num_nodes, keys % num_nodes
+
+
+def lfr(num_nodes, mu, average_degree, max_degree, tau1=2.0, tau2=1.0, min_community=None, max_community=None, seed=None):
+    """
+    Construct Lancichinetti-Fortunato-Radicchi benchmark graph. Degrees and community sizes
+    are sampled from power-law distributions. A fraction of 1 - mu of the stubs of each node
+    is paired with stubs within its community and the rest with stubs in other communities
+    using the configuration model.
+
+    Args:
+        num_nodes (int): Number of nodes
+        mu (float): Fraction of links of each node leading outside its community
+        average_degree (float): Average node degree
+        max_degree (int): Maximum node degree
+        tau1 (float): Exponent of the degree distribution
+        tau2 (float): Exponent of the community size distribution
+        min_community (int): Minimum community size. If None, the minimum degree is used
+        max_community (int): Maximum community size. If None, the maximum degree is used
+        seed (int): Seed for the random number generator
+
+    Returns:
+        (tuple): Adjacency matrix in CSR format and array of community labels of nodes
+    """
+
+    # Check parameters.
+    if not 0 <= mu <= 1 or not 1 <= average_degree < max_degree < num_nodes:
+        raise(ValueError("the parameters must satisfy 0 <= mu <= 1 and 1 <= average_degree < max_degree < num_nodes"))
+    rng = np.random.default_rng(seed)
+
+    # Sample degrees with required average. Make sum of degrees even.
+    min_degree = _power_law_min(tau1, average_degree, max_degree)
+    degrees = _power_law_sample(rng, num_nodes, tau1, min_degree, max_degree)
+    degrees[0] += degrees.sum() % 2
+
+    # Sample community sizes and assign nodes to communities.
+    min_community = int(np.rint(min_degree)) if min_community is None else min_community
+    max_community = max_degree if max_community is None else max_community
+    sizes = _community_sizes(rng, num_nodes, tau2, min_community, max_community)
+    degrees_in = np.rint((1-mu)*degrees).astype(np.int64)
+    labels = _assign_communities(rng, sizes, degrees_in)
+
+    # Make number of internal stubs in each community even by moving a stub to the external stubs.
+    odd = np.flatnonzero(np.bincount(labels, weights=degrees_in, minlength=len(sizes)) % 2 == 1)
+    order = np.lexsort((-degrees_in, labels))
+    first_in_comm = order[np.searchsorted(labels[order], odd)]
+    degrees_in[first_in_comm] -= 1
+    degrees_out = degrees - degrees_in
+
+    # Wire internal stubs within communities and external stubs between communities.
+    nodes_by_comm = np.argsort(labels, kind='stable')
+    stubs_in = np.repeat(nodes_by_comm, degrees_in[nodes_by_comm])
+    src_in, dst_in = _wire_stubs(rng, stubs_in, labels[stubs_in], num_nodes)
+    stubs_out = np.repeat(np.arange(num_nodes), degrees_out)
+    src_out, dst_out = _wire_stubs(rng, stubs_out, None, num_nodes, labels=labels)
+
+    # Construct adjacency matrix.
+    adj = _symmetric_adjacency(np.concatenate((src_in, src_out)), np.concatenate((dst_in, dst_out)), num_nodes)
+    return adj, labels
+
+
+def lancichinetti_generated(num_nodes, mu, average_degree=20, max_degree=50, seed=None, **kwargs):
+    """
+    Construct Lancichinetti benchmark graph with specified number of nodes and mu parameter.
+
+    Args:
+        num_nodes (int): Number of nodes
+        mu (float): The mu parameter
+        average_degree (float): Average node degree
+        max_degree (int): Maximum node degree
+        seed (int): Seed for the random number generator
+        **kwargs (dict): Additional keyword arguments for the lfr function
+
+    Returns:
+        (tuple): Constructed graph and ground truth in required format
+    """
+
+    adj, labels = lfr(num_nodes, mu, average_degree, max_degree, seed=seed, **kwargs)
+    return to_networkx(adj, labels), labels_to_ground_truth(labels)
+
+
+def erdos_renyi_csr(num_nodes, average_degree, seed=None):
+    """
+    Construct Erdos-Renyi random graph with specified number of nodes and specified average degree
+    in CSR format.
+
+    Args:
+        num_nodes (int): Number of nodes in constructed Erdos-Renyi random graph.
+        average_degree (int): Average degree in constructed Erdos-Renyi random graph
+        seed (int): Seed for the random number generator
+
+    Returns:
+        (tuple): Adjacency matrix in CSR format and array of connected component labels of nodes
+    """
+
+    # Construct graph in CSR format and find its connected components (ground truth).
+    indptr, indices = random_graphs.gnp(num_nodes, min(average_degree/num_nodes, 1.0), seed=seed)
+    adj = sp.csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(num_nodes, num_nodes))
+    _, labels = csgraph.connected_components(adj, directed=False)
+    return adj, labels
+
+
+def erdos_renyi(num_nodes, average_degree, seed=None):
     """
     Construct Erdos-Renyi random graph with specified number of nodes and specified average degree.
 
     Args:
         num_nodes (int): Number of nodes in constructed Erdos-Renyi random graph.
         average_degree (int): Average degree in constructed Erdos-Renyi random graph
+        seed (int): Seed for the random number generator
 
     Returns:
         (tuple): Parsed network and ground truth in required format
     """
-    # Construct graph and return it along with its connected components as communities (ground truth).
-    graph = nx.erdos_renyi_graph(num_nodes, average_degree/num_nodes, directed=False)
-    return graph, list(nx.algorithms.components.connected_components(graph))
+    adj, labels = erdos_renyi_csr(num_nodes, average_degree, seed=seed)
+    return to_networkx(adj), labels_to_ground_truth(labels)
 
 
 def bottlenose_dolphins():
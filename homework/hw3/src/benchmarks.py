@@ -3,6 +3,7 @@ from cdlib import algorithms
 import networkx as nx
 import benchmark_graphs
 import benchmark_utils
+import replicates
 import pickle
 import os
 import sys
@@ -22,6 +23,7 @@ def benchmark_gn():
     GN_GROUP_SIZES = 24  # group sizes in benchmark graph
     GN_EXPECTED_DEGREE = 20  # expected degree in benchmark graph
     gn_mu_vals = (0.0, 0.1, 0.2, 0.3, 0.4, 0.5)  # list of mu values for benchmark graph
+    SEED = 0  # root seed for constructing benchmark graphs
     
     # Initialize lists for storing results for different mu values.
     y_vals_label_prop = []
@@ -37,11 +39,12 @@ def benchmark_gn():
         nmi_louvain = []
         nmi_infomap = []
 
-        # Repeat benchmark graph construction and community detection specified number of times.
-        for _ in range(NUM_REP):
+        # Construct specified number of benchmark graphs with specified properties.
+        reps = replicates.generate_replicates('girvan-newman', NUM_REP, seed=[SEED, idx], num_groups=GN_NUM_GROUPS, \
+                group_sizes=GN_GROUP_SIZES, expected_degree=GN_EXPECTED_DEGREE, mu=mu)
 
-            # Construct benchmark graph with specified properties.
-            graph, ground_truth = benchmark_graphs.girvan_newman(GN_NUM_GROUPS, GN_GROUP_SIZES, GN_EXPECTED_DEGREE, mu)
+        # Perform community detection on each constructed graph.
+        for graph, ground_truth in reps.graphs():
 
             # Get detections for algorithms.
             res_label_prop = benchmark_utils.normalize_community_format(nx.algorithms.community.label_propagation.label_propagation_communities(graph), 'label_propagation')
@@ -127,6 +130,7 @@ def benchmark_er():
     NUM_REP = 25  # number of algorithm repetitions (on newly constructed graph)
     NUM_NODES = 1000  # number of nodes in benchmark graph
     er_average_degrees = (8, 16, 24, 32, 40)  # list of average degrees for benchmark graph
+    SEED = 0  # root seed for constructing benchmark graphs
 
     # Initialize lists for storing results for different mu values.
     y_vals_label_prop = []
@@ -142,11 +146,11 @@ def benchmark_er():
         nvi_louvain = []
         nvi_infomap = []
 
-        # Repeat benchmark graph construction and community detection specified number of times.
-        for _ in range(NUM_REP):
+        # Construct specified number of benchmark graphs with specified properties.
+        reps = replicates.generate_replicates('erdos-renyi', NUM_REP, seed=[SEED, idx], num_nodes=NUM_NODES, average_degree=av_deg)
 
-            # Construct benchmark graph with specified properties.
-            graph, ground_truth = benchmark_graphs.erdos_renyi(NUM_NODES, av_deg)
+        # Perform community detection on each constructed graph.
+        for graph, ground_truth in reps.graphs():
 
             # Get detections for algorithms.
             res_label_prop = benchmark_utils.normalize_community_format(\
@@ -2,6 +2,9 @@ import networkx as nx
 import numpy as np
 import re
 import parse_network
+import csr
+import triangles
+import neighbor_stats
 from sklearn import preprocessing
 from sklearn.metrics import classification_report
 
@@ -28,7 +31,36 @@ def get_tts(network):
     return train_idxs, test_idxs
 
 
-def get_features_node(node, network, bow):
+def get_structural_features(network):
+    """
+    Compute degree, aggregates of degrees of neighbors, number of triangles and aggregates of
+    numbers of triangles of neighbors for all nodes at once.
+
+    Args:
+        network (object): The network for which to compute the features
+
+    Returns:
+        (dict): Dictionary mapping nodes to their structural features (degree, mean, maximum,
+        minimum and standard deviation of degrees of neighbors, number of triangles and mean,
+        maximum and minimum number of triangles of neighbors)
+    """
+
+    # Get CSR representation of network and count triangles.
+    indptr, indices, nodes = csr.graph_to_csr(network)
+    degrees = np.diff(indptr)
+    num_triangles = triangles.triangle_counts(indptr, indices)
+
+    # Aggregate degrees and numbers of triangles of neighbors.
+    _, _, mean_degree_neigh, min_degree_neigh, max_degree_neigh, std_degree_neigh = neighbor_stats.neighbor_aggregates(indptr, indices, degrees)
+    _, _, mean_triangles_neigh, min_triangles_neigh, max_triangles_neigh, _ = neighbor_stats.neighbor_aggregates(indptr, indices, num_triangles)
+
+    # Stack features and map nodes to rows.
+    features = np.column_stack((degrees, mean_degree_neigh, max_degree_neigh, min_degree_neigh, std_degree_neigh,
+        num_triangles, mean_triangles_neigh, max_triangles_neigh, min_triangles_neigh))
+    return dict(zip(nodes, features))
+
+
+def get_features_node(node, network, bow, structural):
     """
     Get features for specified node.
 
@@ -36,6 +68,8 @@ def get_features_node(node, network, bow):
         node (str): Node index
         network (object): The network the node is part of
         bow (list): List of all node labels
+        structural (dict): Dictionary mapping nodes to their structural features (computed once
+        for the network with get_structural_features)
 
     Returns:
         (numpy.ndarray): Vector of features for the current node
@@ -47,9 +81,7 @@ def get_features_node(node, network, bow):
     # Get target value.
     target = re.findall('[a-zA-Z]+', name)[0]
     
-    # Compute degree, mean degree of neighbors, number of triangles the
-    # node forms with neighbors.
-    degree = network.degree[node]
+    # Get neighbors and their labels (the structural features are precomputed).
     neighbors = [n for n in network.neighbors(node)]
     neighbors_names = [re.findall('[a-zA-Z]+', network.node[neigh]['name'])[0] for neigh in neighbors]
     
@@ -58,51 +90,14 @@ def get_features_node(node, network, bow):
     for idx, w in enumerate(bow):
         bow_feature[idx] = neighbors_names.count(w)
 
-    
-    # Compute mean degree of neighbors.
-    mean_degree_neigh = np.mean([network.degree[neigh] for neigh in neighbors])
-
-    # Compute maximum degree of neighbors.
-    max_degree_neigh = np.max([network.degree[neigh] for neigh in neighbors])
-
-    # Compute minimum degree of neighbors.
-    min_degree_neigh = np.min([network.degree[neigh] for neigh in neighbors])
-
-    # Compute standard deviation of degree of neighbors.
-    std_degree_neigh = np.std([network.degree[neigh] for neigh in neighbors])
-
     # Compute number of neighbors with same target.
     num_neighbors_same_target = 0
     for neigh in neighbors:
         if re.findall('[a-zA-Z]+', network.node[neigh]['name'])[0] == target:
             num_neighbors_same_target += 1
     
-    # Compute number of triangles including current nodes.
-    num_triangles_this = nx.triangles(network, node)
-
-    # Compute mean number of triagles including one of the neighbors.
-    triangles_neighbors = [nx.triangles(network, neigh) for neigh in neighbors]
-    
-    # Compute mean number of triangles of neighbors.
-    mean_triangles_neigh = np.mean(triangles_neighbors)
-
-    # Compute maximum number of triangles of neighbors.
-    max_triangles_neigh = np.max(triangles_neighbors)
-    
-    # Compute minimum number of triangles of neighbors.
-    min_triangles_neigh = np.min(triangles_neighbors)
-    
     # Construct features vectors.
-    feature_vec = np.append(np.array([degree, 
-                            mean_degree_neigh, 
-                            max_degree_neigh, 
-                            min_degree_neigh, 
-                            std_degree_neigh, 
-                            num_neighbors_same_target, 
-                            num_triangles_this, 
-                            mean_triangles_neigh, 
-                            max_triangles_neigh, 
-                            min_triangles_neigh]), bow_feature)
+    feature_vec = np.concatenate((structural[node][:5], [num_neighbors_same_target], structural[node][5:], bow_feature))
     
     # Return features vector and target variable.
     return feature_vec, target
@@ -128,11 +123,14 @@ def get_features(network, node_idxs):
 
     # Get label encoder and "bag-of-words".
     le, bow = get_label_encoder_and_bow(network)
+
+    # Compute structural features of all nodes at once.
+    structural = get_structural_features(network)
     
     # Go over specified nodes and compute features.
     for idx, node in enumerate(node_idxs):
         print('done {0}/{1}'.format(idx, len(node_idxs)))
-        feature_vec_nxt, target_nxt = get_features_node(node, network, bow)
+        feature_vec_nxt, target_nxt = get_features_node(node, network, bow, structural)
         target.append(target_nxt)
         if data is None:
             data = feature_vec_nxt
@@ -5,6 +5,7 @@ import community
 from scipy.special import comb
 from collections import Counter
 import parse_network
+import random_walk_restart
 
 
 def link_prediction_auc(network, prediction_func):
@@ -14,7 +15,8 @@ def link_prediction_auc(network, prediction_func):
 
     Args:
         network (object): The network on which to evaluate the link prediction mechanism
-        prediction_func (function): The function implementing link prediction index computation
+        prediction_func (function): The function implementing link prediction index computation. If
+        the function has the bulk attribute set, it is called once with the list of all pairs.
 
     Returns:
         (float): AUC score of method
@@ -37,8 +39,13 @@ def link_prediction_auc(network, prediction_func):
     # Compute the link prediction index s for all pairs of nodes in union of L_{N}
     # and L_{P}.
     # link_prediction_indices = lp_idx(negative_examples + positive_examples)
-    lp_ind_n = [prediction_func(network, link) for link in negative_examples]
-    lp_ind_p = [prediction_func(network, link) for link in positive_examples]
+    if getattr(prediction_func, 'bulk', False):
+        # Compute indices of all pairs in one call.
+        lp_ind = prediction_func(network, negative_examples + positive_examples)
+        lp_ind_n, lp_ind_p = lp_ind[:len(negative_examples)], lp_ind[len(negative_examples):]
+    else:
+        lp_ind_n = [prediction_func(network, link) for link in negative_examples]
+        lp_ind_p = [prediction_func(network, link) for link in positive_examples]
 
     # Sample m/10 pairs from L_{N} and m/10 pairs from L_{P} with repetitions.
     samp_lp_ind_n = random.choices(lp_ind_n, k=int(math.ceil(network.number_of_edges()/10)))
@@ -79,6 +86,11 @@ def get_index_func(kind, network):
             return 0
         else:
             return mc[communities[link[0]]]/comb(nc[communities[link[0]]], 2)
+
+    # Compute random walk with restart index for list of links (in bulk).
+    def random_walk_restart_index(network, links):
+        return random_walk_restart.score_links(network, links)
+    random_walk_restart_index.bulk = True
     
     #################################################
 
@@ -101,6 +113,8 @@ def get_index_func(kind, network):
         nc = Counter(communities.values())
         mc = get_mc(network, communities)
         return lambda network, link: community_index(network, communities, nc, mc, link)
+    elif kind == 'random-walk-restart':
+        return random_walk_restart_index
     else:
         raise(ValueError('Unknown index function specified.'))
 
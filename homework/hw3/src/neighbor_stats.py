@@ -0,0 +1,93 @@
+import numpy as np
+import csr
+
+
+def neighbor_aggregates(indptr, indices, values):
+    """
+    Compute aggregates of values of neighbors of all nodes at once by gathering the values
+    in CSR order and reducing each neighbor list segment. The aggregates of nodes without
+    neighbors (except the count and the sum) are NaN.
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers
+        indices (numpy.ndarray): Array of neighbor indices
+        values (numpy.ndarray): Value of each node
+
+    Returns:
+        (tuple): Arrays of numbers of neighbors and sums, means, minimums, maximums and
+        standard deviations of values of neighbors of each node
+    """
+
+    # Gather values of neighbors and get starts of non-empty neighbor lists.
+    num_nodes = len(indptr) - 1
+    gathered = np.asarray(values, dtype=float)[indices]
+    counts = np.diff(indptr)
+    nonempty = counts > 0
+    starts = indptr[:-1][nonempty]
+
+    # Reduce segments of non-empty neighbor lists.
+    sums = np.zeros(num_nodes, dtype=float)
+    means, mins, maxs, stds = (np.full(num_nodes, np.nan) for _ in range(4))
+    if len(starts) > 0:
+        sums[nonempty] = np.add.reduceat(gathered, starts)
+        means[nonempty] = sums[nonempty]/counts[nonempty]
+        mins[nonempty] = np.minimum.reduceat(gathered, starts)
+        maxs[nonempty] = np.maximum.reduceat(gathered, starts)
+        deviations = gathered - np.repeat(means, counts)
+        stds[nonempty] = np.sqrt(np.add.reduceat(deviations*deviations, starts)/counts[nonempty])
+
+    return counts, sums, means, mins, maxs, stds
+
+
+def degree_assortativity(indptr, indices, neighbor_degree_sums=None):
+    """
+    Compute degree assortativity coefficient of undirected graph (Pearson correlation of degrees
+    at the ends of edges) from the sums of degrees of neighbors of nodes.
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers (each edge listed in both directions)
+        indices (numpy.ndarray): Array of neighbor indices
+        neighbor_degree_sums (numpy.ndarray): Sum of degrees of neighbors of each node. If None, the sums are computed
+
+    Returns:
+        (float): Degree assortativity coefficient
+    """
+    degrees = np.diff(indptr).astype(float)
+    if neighbor_degree_sums is None:
+        neighbor_degree_sums = neighbor_aggregates(indptr, indices, degrees)[1]
+
+    # Compute moments of degrees at ends of edges (each edge counted in both directions).
+    num_ends = degrees.sum()
+    mean = np.sum(degrees*degrees)/num_ends
+    variance = np.sum(degrees**3)/num_ends - mean*mean
+    covariance = np.sum(degrees*neighbor_degree_sums)/num_ends - mean*mean
+    return covariance/variance if variance > 0 else np.nan
+
+
+def graph_neighbor_aggregates(graph, values):
+    """
+    Compute aggregates of values of neighbors of all nodes of networkx graph.
+
+    Args:
+        graph (object): Networkx representation of the graph
+        values (dict): Dictionary mapping nodes to their values
+
+    Returns:
+        (dict): Dictionary mapping nodes to tuples of number of neighbors and sum, mean,
+        minimum, maximum and standard deviation of values of neighbors
+    """
+    indptr, indices, nodes = csr.graph_to_csr(graph)
+    aggregates = neighbor_aggregates(indptr, indices, np.array([values[node] for node in nodes], dtype=float))
+    return dict(zip(nodes, zip(*(agg.tolist() for agg in aggregates))))
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    import random_graphs
+    indptr, indices = random_graphs.gnm(10**6, 5*10**6, seed=0)
+    start = time.time()
+    degrees = np.diff(indptr)
+    counts, sums, means, mins, maxs, stds = neighbor_aggregates(indptr, indices, degrees)
+    r = degree_assortativity(indptr, indices, sums)
+    print("Computed neighbor aggregates in {0:.2f}s (assortativity {1:.4f})".format(time.time() - start, r))
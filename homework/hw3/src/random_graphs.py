@@ -0,0 +1,160 @@
+import networkx as nx
+import numpy as np
+import csr
+
+
+def decode_pairs(idxs):
+    """
+    Decode indices of node pairs (a, b) with a < b enumerated as (0, 1), (0, 2), (1, 2), (0, 3), ...
+    Author: Jernej Vivod
+
+    Args:
+        idxs (numpy.ndarray): Indices of pairs.
+
+    Returns:
+        (tuple): Arrays of first and second nodes of pairs.
+    """
+
+    # Compute second nodes and correct rounding errors.
+    idxs = np.asarray(idxs, dtype=np.int64)
+    second = np.floor((1.0 + np.sqrt(1.0 + 8.0*idxs))/2.0).astype(np.int64)
+    second -= second*(second-1)//2 > idxs
+    second += (second+1)*second//2 <= idxs
+    return idxs - second*(second-1)//2, second
+
+
+def gnp_edges(num_nodes, p, seed=None):
+    """
+    Sample edges of Erdos-Renyi random graph G(n, p). The gaps between indices of consecutive
+    edges in the enumeration of node pairs are geometrically distributed so only the edges
+    are sampled and not all node pairs.
+    Author: Jernej Vivod
+
+    Args:
+        num_nodes (int): Number of nodes.
+        p (float): Probability of a link between any two nodes.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Array of first endpoints and array of second endpoints of edges.
+    """
+
+    # Check parameters.
+    if not 0 <= p <= 1:
+        raise(ValueError("the probability p must be in interval [0, 1]"))
+    rng = np.random.default_rng(seed)
+    num_pairs = num_nodes*(num_nodes-1)//2
+    if p == 0 or num_pairs == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Sample gaps in batches until the enumeration of node pairs is exhausted.
+    expected = num_pairs*p
+    batch_size = int(expected + 6*np.sqrt(expected)) + 16
+    idxs = [np.cumsum(rng.geometric(p, size=batch_size)) - 1]
+    while idxs[-1][-1] < num_pairs:
+        idxs.append(idxs[-1][-1] + np.cumsum(rng.geometric(p, size=batch_size)))
+    idxs = np.concatenate(idxs)
+    return decode_pairs(idxs[:np.searchsorted(idxs, num_pairs)])
+
+
+def gnm_edges(num_nodes, num_edges, seed=None):
+    """
+    Sample edges of Erdos-Renyi random graph G(n, m) by selecting distinct indices of node
+    pairs uniformly at random. The numpy implementation rejects repeated indices using
+    a hash set (Floyd's algorithm) so the time is proportional to the number of edges.
+    Author: Jernej Vivod
+
+    Args:
+        num_nodes (int): Number of nodes.
+        num_edges (int): Number of edges.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Array of first endpoints and array of second endpoints of edges.
+    """
+
+    # Check parameters.
+    num_pairs = num_nodes*(num_nodes-1)//2
+    if not 0 <= num_edges <= num_pairs:
+        raise(ValueError("the number of edges must be between 0 and the number of node pairs"))
+    rng = np.random.default_rng(seed)
+    return decode_pairs(rng.choice(num_pairs, size=num_edges, replace=False))
+
+
+def undirected_csr(src, dst, num_nodes):
+    """
+    Construct CSR adjacency arrays of undirected graph from its edges.
+    Author: Jernej Vivod
+
+    Args:
+        src (numpy.ndarray): Array of first endpoints of edges.
+        dst (numpy.ndarray): Array of second endpoints of edges.
+        num_nodes (int): Number of nodes.
+
+    Returns:
+        (tuple): Array of row pointers and array of neighbor indices.
+    """
+    return csr.edges_to_csr(np.concatenate((src, dst)), np.concatenate((dst, src)), num_nodes)
+
+
+def gnp(num_nodes, p, seed=None):
+    """
+    Construct Erdos-Renyi random graph G(n, p) in CSR format.
+    Author: Jernej Vivod
+
+    Args:
+        num_nodes (int): Number of nodes.
+        p (float): Probability of a link between any two nodes.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Array of row pointers and array of neighbor indices.
+    """
+    return undirected_csr(*gnp_edges(num_nodes, p, seed), num_nodes)
+
+
+def gnm(num_nodes, num_edges, seed=None):
+    """
+    Construct Erdos-Renyi random graph G(n, m) in CSR format.
+    Author: Jernej Vivod
+
+    Args:
+        num_nodes (int): Number of nodes.
+        num_edges (int): Number of edges.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        (tuple): Array of row pointers and array of neighbor indices.
+    """
+    return undirected_csr(*gnm_edges(num_nodes, num_edges, seed), num_nodes)
+
+
+def csr_to_networkx(indptr, indices):
+    """
+    Construct networkx representation of undirected graph from its CSR adjacency arrays.
+    Author: Jernej Vivod
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers.
+        indices (numpy.ndarray): Array of neighbor indices.
+
+    Returns:
+        (obj): Networkx representation of the graph.
+    """
+    num_nodes = len(indptr) - 1
+    src = np.repeat(np.arange(num_nodes), np.diff(indptr))
+    upper = src < indices
+    graph = nx.empty_graph(n=num_nodes, create_using=nx.Graph)
+    graph.add_edges_from(zip(src[upper].tolist(), indices[upper].tolist()))
+    return graph
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    start = time.time()
+    indptr, indices = gnm(10**6, 5*10**6, seed=0)
+    print("Constructed G(n, m) with {0} edges in {1:.2f}s".format(len(indices)//2, time.time() - start))
+    start = time.time()
+    indptr, indices = gnp(10**6, 10.0/10**6, seed=0)
+    print("Constructed G(n, p) with {0} edges in {1:.2f}s".format(len(indices)//2, time.time() - start))
@@ -0,0 +1,169 @@
+import numpy as np
+import scipy.sparse as sp
+import csr
+
+
+def transition_matrix(indptr, indices):
+    """
+    Construct column-stochastic transition matrix of the random walk on the graph.
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers
+        indices (numpy.ndarray): Array of neighbor indices
+
+    Returns:
+        (tuple): Transition matrix in CSR format where element (j, i) is the probability
+        of moving from node i to node j and boolean array marking nodes without neighbors
+    """
+
+    # Compute degrees and mark nodes without neighbors.
+    num_nodes = len(indptr) - 1
+    degrees = np.diff(indptr)
+    dangling = degrees == 0
+
+    # Construct row-stochastic adjacency matrix and transpose it.
+    inv_degrees = np.zeros(num_nodes, dtype=float)
+    inv_degrees[~dangling] = 1.0/degrees[~dangling]
+    adj = sp.csr_matrix((np.repeat(inv_degrees, degrees), indices, indptr), shape=(num_nodes, num_nodes))
+    return adj.T.tocsr(), dangling
+
+
+def personalized_pagerank_batch(trans, dangling, seeds, alpha=0.85, tol=1.0e-6, max_iter=100):
+    """
+    Compute personalized PageRank vectors (random walk with restart) for a batch of seed
+    nodes at once by propagating a dense matrix with one column per seed.
+
+    Args:
+        trans (scipy.sparse.csr_matrix): Column-stochastic transition matrix
+        dangling (numpy.ndarray): Boolean array marking nodes without neighbors
+        seeds (numpy.ndarray): Indices of seed nodes
+        alpha (float): Probability of continuing the walk (1 - restart probability)
+        tol (float): Convergence tolerance for the L1 change of each column
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        (numpy.ndarray): Matrix where column j is the personalized PageRank vector of seed j
+    """
+
+    # Initialize restart matrix with one column per seed.
+    restart = np.zeros((trans.shape[0], len(seeds)), dtype=float)
+    restart[seeds, np.arange(len(seeds))] = 1.0
+    x = restart.copy()
+
+    # Propagate all columns at once. Walks stuck in nodes without neighbors restart at the seed.
+    for _ in range(max_iter):
+        x_last = x
+        x = alpha*(trans.dot(x_last) + restart*x_last[dangling].sum(axis=0)) + (1.0 - alpha)*restart
+        if np.abs(x - x_last).sum(axis=0).max() < tol:
+            break
+    return x
+
+
+def personalized_pagerank_push(indptr, indices, seed, alpha=0.85, eps=1.0e-4, work=None):
+    """
+    Compute approximate personalized PageRank vector of seed node using local push
+    operations. Only nodes whose residual exceeds eps times their degree are processed
+    and only the neighbors updated in a round are checked for the next round, so the
+    work is proportional to the explored neighborhood of the seed (and not to the number
+    of nodes). The residuals and estimates are kept in work arrays of which only the
+    touched entries are reset at the end.
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers
+        indices (numpy.ndarray): Array of neighbor indices
+        seed (int): Index of the seed node
+        alpha (float): Probability of continuing the walk (1 - restart probability)
+        eps (float): Residual threshold per unit of degree
+        work (tuple): Pair of zero-filled arrays of length equal to the number of nodes reused between
+        calls (left zero-filled). If None, the arrays are allocated
+
+    Returns:
+        (tuple): Sorted array of nodes with non-zero estimates and array of their estimates
+    """
+
+    # Initialize estimates and residuals.
+    estimate, residual = (np.zeros(len(indptr) - 1), np.zeros(len(indptr) - 1)) if work is None else work
+    residual[seed] = 1.0
+    active = np.array([seed])
+    touched = [active]
+
+    # Push residuals of all active nodes in rounds.
+    while active.size > 0:
+        mass = residual[active]
+        residual[active] = 0.0
+        estimate[active] += (1.0 - alpha)*mass
+
+        # Spread remaining mass to neighbors (walks from nodes without neighbors restart at seed).
+        starts, degs = indptr[active], indptr[active + 1] - indptr[active]
+        offsets = np.arange(degs.sum()) - np.repeat(np.cumsum(degs) - degs, degs)
+        updated, pos = np.unique(np.append(indices[np.repeat(starts, degs) + offsets], seed), return_inverse=True)
+        weights = np.append(np.repeat(alpha*mass/np.maximum(degs, 1), degs), alpha*mass[degs == 0].sum())
+        residual[updated] += np.bincount(pos.ravel(), weights=weights, minlength=len(updated))
+        touched.append(updated)
+
+        # Find updated nodes with residual above threshold.
+        active = updated[residual[updated] > eps*np.maximum(indptr[updated + 1] - indptr[updated], 1)]
+
+    # Get estimates of touched nodes and reset work arrays.
+    touched = np.unique(np.concatenate(touched))
+    values = estimate[touched]
+    estimate[touched] = 0.0
+    residual[touched] = 0.0
+    nonzero = values > 0
+    return touched[nonzero], values[nonzero]
+
+
+def score_links(network, links, alpha=0.85, batch_size=128, method='power', eps=1.0e-4):
+    """
+    Compute random walk with restart index for a list of node pairs. The personalized PageRank
+    vectors are computed for batches of first endpoints of the pairs. The index of pair (u, v)
+    is p_u(v) + p_v(u) where p_v(u) = p_u(v)*deg(u)/deg(v) holds for undirected networks.
+
+    Args:
+        network (object): The (undirected) network
+        links (list): List of pairs of nodes
+        alpha (float): Probability of continuing the walk (1 - restart probability)
+        batch_size (int): Number of seed nodes to process at once
+        method (str): Method for computing personalized PageRank ('power' or 'push')
+        eps (float): Residual threshold per unit of degree for the push method
+
+    Returns:
+        (list): Index values for the node pairs
+    """
+
+    # Check if specified method valid.
+    if method not in {'power', 'push'}:
+        raise(ValueError("the method parameter can take the values of 'power' or 'push'"))
+
+    # Get CSR representation of network and map endpoints of links to indices.
+    indptr, indices, nodes = csr.graph_to_csr(network)
+    node_to_idx = {node: idx for idx, node in enumerate(nodes)}
+    src = np.array([node_to_idx[link[0]] for link in links], dtype=np.int64)
+    dst = np.array([node_to_idx[link[1]] for link in links], dtype=np.int64)
+
+    # Go over unique seeds (in batches for the power method) and get personalized PageRank of second endpoints.
+    seeds, seed_pos = np.unique(src, return_inverse=True)
+    ppr_src_dst = np.empty(len(links), dtype=float)
+    if method == 'power':
+        trans, dangling = transition_matrix(indptr, indices)
+        for start in range(0, len(seeds), batch_size):
+            seeds_batch = seeds[start:start+batch_size]
+            ppr = personalized_pagerank_batch(trans, dangling, seeds_batch, alpha=alpha)
+            in_batch = (seed_pos >= start) & (seed_pos < start + len(seeds_batch))
+            ppr_src_dst[in_batch] = ppr[dst[in_batch], seed_pos[in_batch] - start]
+    else:
+
+        # Compute sparse vector of each seed and look up second endpoints of its links.
+        work = (np.zeros(len(nodes)), np.zeros(len(nodes)))
+        order = np.argsort(seed_pos, kind='stable')
+        bounds = np.searchsorted(seed_pos[order], np.arange(len(seeds) + 1))
+        for idx, seed in enumerate(seeds):
+            links_seed = order[bounds[idx]:bounds[idx+1]]
+            ppr_nodes, ppr_values = personalized_pagerank_push(indptr, indices, seed, alpha, eps, work)
+            loc = np.minimum(np.searchsorted(ppr_nodes, dst[links_seed]), len(ppr_nodes) - 1)
+            ppr_src_dst[links_seed] = np.where(ppr_nodes[loc] == dst[links_seed], ppr_values[loc], 0.0)
+
+    # Add personalized PageRank in opposite direction using the symmetry of undirected networks.
+    degrees = np.diff(indptr)
+    ratio = np.divide(degrees[src], degrees[dst], out=np.zeros(len(links)), where=degrees[dst] > 0)
+    return list(ppr_src_dst*(1.0 + ratio))
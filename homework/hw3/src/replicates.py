@@ -0,0 +1,171 @@
+import os
+import multiprocessing
+import numpy as np
+import scipy.sparse as sp
+import barabasi_albert
+import benchmark_graphs
+
+
+def _barabasi_albert_csr(num_nodes, m, m0=None, seed=None):
+    """
+    Construct Barabasi-Albert graph in CSR format.
+
+    Args:
+        num_nodes (int): Number of nodes
+        m (int): Number of edges added with each new node
+        m0 (int): Number of nodes in the initial fully connected graph
+        seed (int): Seed for the random number generator
+
+    Returns:
+        (tuple): Adjacency matrix in CSR format and None (the graph has no ground truth)
+    """
+    src, dst = barabasi_albert.barabasi_albert_edges(num_nodes, m, m0=m0, seed=seed)
+    return benchmark_graphs._symmetric_adjacency(src, dst, num_nodes), None
+
+
+# Functions constructing graphs of supported kinds in CSR format along with community labels.
+GENERATORS = {
+    'girvan-newman': benchmark_graphs.girvan_newman_csr,
+    'erdos-renyi': benchmark_graphs.erdos_renyi_csr,
+    'lfr': benchmark_graphs.lfr,
+    'barabasi-albert': _barabasi_albert_csr,
+}
+
+
+def _generate_replicate(task):
+    """
+    Construct replicate graph and get its edges and community labels as compact arrays.
+
+    Args:
+        task (tuple): Kind of graph, dictionary of parameters and seed sequence of the replicate
+
+    Returns:
+        (tuple): Number of nodes, arrays of first and second endpoints of edges and array
+        of community labels (None if graph has no ground truth)
+    """
+    kind, params, seed_seq = task
+    adj, labels = GENERATORS[kind](seed=seed_seq, **params)
+    upper = sp.triu(adj, k=1).tocoo()
+    labels = labels.astype(np.int32) if labels is not None else None
+    return adj.shape[0], upper.row.astype(np.int32), upper.col.astype(np.int32), labels
+
+
+class Replicates:
+    """
+    Replicate graphs packed into contiguous arrays. The edges of replicate i are at positions
+    edge_ptr[i], ..., edge_ptr[i+1]-1 of the arrays src and dst and the community labels of its
+    nodes at positions label_ptr[i], ..., label_ptr[i+1]-1 of the array labels.
+
+    Args:
+        results (list): List of results of _generate_replicate for the replicates in order
+    """
+
+    def __init__(self, results):
+        self.num_nodes = np.array([res[0] for res in results], dtype=np.int64)
+        self.edge_ptr = np.concatenate(([0], np.cumsum([len(res[1]) for res in results]))).astype(np.int64)
+        self.src = np.concatenate([res[1] for res in results]) if results else np.zeros(0, dtype=np.int32)
+        self.dst = np.concatenate([res[2] for res in results]) if results else np.zeros(0, dtype=np.int32)
+        self.has_labels = all(res[3] is not None for res in results)
+        label_sizes = self.num_nodes if self.has_labels else np.zeros(len(results), dtype=np.int64)
+        self.label_ptr = np.concatenate(([0], np.cumsum(label_sizes))).astype(np.int64)
+        self.labels = np.concatenate([res[3] for res in results]) if self.has_labels and results else np.zeros(0, dtype=np.int32)
+
+
+    def __len__(self):
+        return len(self.num_nodes)
+
+
+    def edges(self, idx):
+        """
+        Get edges of replicate.
+
+        Args:
+            idx (int): Index of the replicate
+
+        Returns:
+            (tuple): Arrays of first and second endpoints of edges
+        """
+        return self.src[self.edge_ptr[idx]:self.edge_ptr[idx+1]], self.dst[self.edge_ptr[idx]:self.edge_ptr[idx+1]]
+
+
+    def adjacency(self, idx):
+        """
+        Get adjacency matrix of replicate.
+
+        Args:
+            idx (int): Index of the replicate
+
+        Returns:
+            (scipy.sparse.csr_matrix): Adjacency matrix
+        """
+        src, dst = self.edges(idx)
+        return benchmark_graphs._symmetric_adjacency(src, dst, self.num_nodes[idx])
+
+
+    def graph(self, idx):
+        """
+        Get networkx representation and ground truth of replicate.
+
+        Args:
+            idx (int): Index of the replicate
+
+        Returns:
+            (tuple): Networkx representation of the graph and ground truth in required format
+            (None if graph has no ground truth)
+        """
+        if not self.has_labels:
+            return benchmark_graphs.to_networkx(self.adjacency(idx)), None
+        labels = self.labels[self.label_ptr[idx]:self.label_ptr[idx+1]]
+        return benchmark_graphs.to_networkx(self.adjacency(idx), labels), benchmark_graphs.labels_to_ground_truth(labels)
+
+
+    def graphs(self):
+        """
+        Iterate over networkx representations and ground truths of replicates.
+
+        Returns:
+            (generator): Generator of tuples of graphs and ground truths
+        """
+        return (self.graph(idx) for idx in range(len(self)))
+
+
+def generate_replicates(kind, num_replicates, seed=None, num_workers=None, **params):
+    """
+    Construct replicate graphs of specified kind in parallel. Each replicate uses its own
+    random number generator seeded from a child of the root seed sequence so the results
+    do not depend on the number of workers.
+
+    Args:
+        kind (str): Kind of graph ('girvan-newman', 'erdos-renyi', 'lfr' or 'barabasi-albert')
+        num_replicates (int): Number of replicates to construct
+        seed (int): Root seed (any entropy accepted by numpy.random.SeedSequence)
+        num_workers (int): Number of worker processes to use. If None, use number of CPUs
+        **params (dict): Parameters for the function constructing graphs of specified kind
+
+    Returns:
+        (object): Replicates instance containing the constructed graphs
+    """
+
+    # Check if specified kind valid.
+    if kind not in GENERATORS:
+        raise(ValueError("the kind parameter can take the values of " + ", ".join("'" + k + "'" for k in GENERATORS)))
+
+    # Derive independent seed sequences for replicates.
+    tasks = [(kind, params, seed_seq) for seed_seq in np.random.SeedSequence(seed).spawn(num_replicates)]
+
+    # Construct replicates in order.
+    num_workers = os.cpu_count() if num_workers is None else num_workers
+    if num_workers == 1 or num_replicates <= 1:
+        results = [_generate_replicate(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(min(num_workers, num_replicates)) as pool:
+            results = pool.map(_generate_replicate, tasks)
+
+    return Replicates(results)
+
+
+### TEST ###
+if __name__ == '__main__':
+    reps = generate_replicates('girvan-newman', 25, seed=0, num_groups=3, group_sizes=24, expected_degree=20, mu=0.1)
+    graph, ground_truth = reps.graph(0)
+    print("Constructed {0} replicates with {1} edges in total".format(len(reps), len(reps.src)))
@@ -0,0 +1,160 @@
+import numpy as np
+import csr
+
+# Maximum number of wedges checked for closure at once.
+MAX_BATCH_WEDGES = 2**22
+
+
+def orient_by_degree(indptr, indices):
+    """
+    Orient edges of undirected graph from lower to higher degree rank (ties broken by index)
+    and relabel nodes by rank. Each node then has at most O(sqrt(m)) outgoing edges.
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers (each edge listed in both directions)
+        indices (numpy.ndarray): Array of neighbor indices
+
+    Returns:
+        (tuple): Array of row pointers and array of neighbor ranks of the oriented graph
+        (sorted within each row) and array of ranks of nodes
+    """
+
+    # Rank nodes by degree.
+    num_nodes = len(indptr) - 1
+    degrees = np.diff(indptr)
+    rank = np.empty(num_nodes, dtype=np.int64)
+    rank[np.argsort(degrees, kind='stable')] = np.arange(num_nodes)
+
+    # Keep edges pointing to higher rank (self-loops are dropped).
+    src = rank[np.repeat(np.arange(num_nodes), degrees)]
+    dst = rank[indices]
+    forward = src < dst
+    return csr.edges_to_csr(src[forward], dst[forward], num_nodes) + (rank,)
+
+
+def triangle_counts(indptr, indices):
+    """
+    Count triangles each node is part of using the compact-forward algorithm. For each node, pairs
+    of its outgoing neighbors in the degree-oriented graph (wedges) are checked for a closing edge
+    by binary search in the sorted edge keys, so each triangle is found exactly once.
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers (each edge listed in both directions)
+        indices (numpy.ndarray): Array of neighbor indices
+
+    Returns:
+        (numpy.ndarray): Number of triangles of each node
+    """
+
+    # Orient graph and get sorted keys of oriented edges.
+    num_nodes = len(indptr) - 1
+    fptr, findices, rank = orient_by_degree(indptr, indices)
+    out_degrees = np.diff(fptr)
+    keys = np.repeat(np.arange(num_nodes), out_degrees)*num_nodes + findices
+
+    # For each position in neighbor lists, get number of wedges it starts (pairs with later neighbors).
+    positions = np.arange(len(findices))
+    num_wedges = fptr[np.repeat(np.arange(num_nodes), out_degrees) + 1] - positions - 1
+    wedge_ptr = np.concatenate(([0], np.cumsum(num_wedges)))
+
+    # Go over batches of positions and count closed wedges.
+    tri = np.zeros(num_nodes, dtype=np.int64)
+    start = 0
+    while start < len(findices):
+        end = max(np.searchsorted(wedge_ptr, wedge_ptr[start] + MAX_BATCH_WEDGES, side='right') - 1, start + 1)
+        counts = num_wedges[start:end]
+
+        # Enumerate wedges (u, v, w) with v and w outgoing neighbors of u and v before w.
+        first = np.repeat(positions[start:end], counts)
+        offsets = np.arange(len(first)) - np.repeat(wedge_ptr[start:end] - wedge_ptr[start], counts)
+        second = first + 1 + offsets
+        v, w = findices[first], findices[second]
+
+        # Check for closing edge (v, w) and count triangles of all three nodes.
+        wedge_keys = v*num_nodes + w
+        loc = np.minimum(np.searchsorted(keys, wedge_keys), max(len(keys) - 1, 0))
+        closed = keys[loc] == wedge_keys
+        u = np.searchsorted(fptr, first[closed], side='right') - 1
+        tri += np.bincount(u, minlength=num_nodes) + np.bincount(v[closed], minlength=num_nodes) + np.bincount(w[closed], minlength=num_nodes)
+        start = end
+
+    # Map counts from ranks back to nodes.
+    return tri[rank]
+
+
+def clustering(indptr, indices, triangles=None):
+    """
+    Compute local clustering coefficients of nodes (0 for nodes with degree below 2).
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers (each edge listed in both directions)
+        indices (numpy.ndarray): Array of neighbor indices
+        triangles (numpy.ndarray): Number of triangles of each node. If None, the triangles are counted
+
+    Returns:
+        (numpy.ndarray): Local clustering coefficients of nodes
+    """
+    triangles = triangle_counts(indptr, indices) if triangles is None else triangles
+    degrees = np.diff(indptr)
+    pairs = degrees*(degrees - 1)/2
+    res = np.zeros(len(degrees), dtype=float)
+    np.divide(triangles, pairs, out=res, where=pairs > 0)
+    return res
+
+
+def transitivity(indptr, indices, triangles=None):
+    """
+    Compute global transitivity (fraction of connected triples that are closed).
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers (each edge listed in both directions)
+        indices (numpy.ndarray): Array of neighbor indices
+        triangles (numpy.ndarray): Number of triangles of each node. If None, the triangles are counted
+
+    Returns:
+        (float): Transitivity of the graph
+    """
+    triangles = triangle_counts(indptr, indices) if triangles is None else triangles
+    degrees = np.diff(indptr)
+    num_triples = np.sum(degrees*(degrees - 1)/2)
+    return triangles.sum()/num_triples if num_triples > 0 else 0.0
+
+
+def triangle_statistics(indptr, indices):
+    """
+    Count triangles and compute local clustering coefficients and transitivity in one pass.
+
+    Args:
+        indptr (numpy.ndarray): Array of row pointers (each edge listed in both directions)
+        indices (numpy.ndarray): Array of neighbor indices
+
+    Returns:
+        (tuple): Number of triangles of each node, local clustering coefficients of nodes
+        and transitivity of the graph
+    """
+    triangles = triangle_counts(indptr, indices)
+    return triangles, clustering(indptr, indices, triangles), transitivity(indptr, indices, triangles)
+
+
+def graph_triangles(graph):
+    """
+    Count triangles each node of networkx graph is part of.
+
+    Args:
+        graph (object): Networkx representation of the undirected graph
+
+    Returns:
+        (dict): Dictionary mapping nodes to their numbers of triangles
+    """
+    indptr, indices, nodes = csr.graph_to_csr(graph)
+    return dict(zip(nodes, triangle_counts(indptr, indices).tolist()))
+
+
+### TEST ###
+if __name__ == '__main__':
+    import time
+    import random_graphs
+    indptr, indices = random_graphs.gnm(10**5, 10**6, seed=0)
+    start = time.time()
+    triangles, local, trans = triangle_statistics(indptr, indices)
+    print("Counted {0} triangles in {1:.2f}s (transitivity {2:.6f})".format(triangles.sum()//3, time.time() - start, trans))